@@ -1,12 +1,19 @@
 from django.contrib import admin
 from django.urls import reverse
+from django.utils.functional import lazy
 from django.utils.html import format_html
+from django.utils.safestring import SafeString
 from django.shortcuts import redirect
 
 # Add a title with dashboard link
 admin.site.site_header = "EventSphere Admin"
 admin.site.site_title = "EventSphere Admin"
-admin.site.index_title = format_html(
-    'Welcome to EventSphere Admin | <a href="{}">📊 View Dashboard</a>',
-    reverse('admin_dashboard')
-)
+
+def _index_title():
+    return format_html(
+        'Welcome to EventSphere Admin | <a href="{}">📊 View Dashboard</a>',
+        reverse('admin_dashboard')
+    )
+
+# Lazy so the URLconf isn't loaded while apps listed after this one still register admins
+admin.site.index_title = lazy(_index_title, SafeString)()
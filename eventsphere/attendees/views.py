@@ -4,8 +4,11 @@ from .models import Attendee
 from .forms import AttendeeForm
 from django.utils import timezone
 from events.models import RSVP, Event
-from django.core.mail import send_mail
-from django.conf import settings
+from events.waitlist import release_rsvps
+from django.db import transaction
+from notifications.digests import record_rsvp_activity, wants_digest
+from notifications.models import RSVPActivity
+from notifications.utils import enqueue_email
 @login_required
 def profile_view(request, attendee_id):
     attendee = get_object_or_404(Attendee, id=attendee_id)
@@ -28,13 +31,15 @@ def attendee_my_events(request):
     rsvps = (
         RSVP.objects
         .select_related('event')
-        .filter(attendee=request.user, status=RSVP.GOING)
+        .filter(attendee=request.user, status__in=(RSVP.GOING, RSVP.WAITLISTED))
         .order_by('-created_at')
     )
 
     today = timezone.localdate()
+    for r in rsvps:
+        r.event.rsvp_status = r.status
     upcoming = [r.event for r in rsvps if r.event.date >= today]
-    past     = [r.event for r in rsvps if r.event.date <  today]
+    past     = [r.event for r in rsvps if r.event.date <  today and r.status == RSVP.GOING]
 
     def sort_key(e):
         return (e.date, e.time or timezone.datetime.min.time())
@@ -53,7 +58,7 @@ def attendee_cancel_rsvp(request, event_id):
     attendee_email = request.user.email
     organizer_email = event.organizer.email
 
-    # Send emails before deleting
+    # Queue emails before deleting
     subject_org = f"RSVP Cancellation for '{event.title}'"
     message_org = (
         f"Hello {event.organizer.username},\n\n"
@@ -72,11 +77,11 @@ def attendee_cancel_rsvp(request, event_id):
         f"— EventSphere Team"
     )
 
-    try:
-        send_mail(subject_org, message_org, settings.DEFAULT_FROM_EMAIL, [organizer_email])
-        send_mail(subject_user, message_user, settings.DEFAULT_FROM_EMAIL, [attendee_email])
-    except Exception as e:
-        print(f"[Email Error] Could not send cancellation emails: {e}")
-
-    rsvp.delete()
+    with transaction.atomic():
+        if wants_digest(event.organizer):
+            record_rsvp_activity(event, attendee_name, RSVPActivity.ACTION_CANCELLED)
+        else:
+            enqueue_email(subject_org, message_org, [organizer_email])
+        enqueue_email(subject_user, message_user, [attendee_email])
+        release_rsvps(RSVP.objects.filter(pk=rsvp.pk))
     return redirect('attendee_my_events')
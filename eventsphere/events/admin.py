@@ -1,21 +1,25 @@
 from django.contrib import admin
-from .models import Event, EventOrganizer, RSVP
+from django.db import transaction
+from .models import Event, EventOrganizer, RSVP, GeocodeCache
+from .moderation import set_approval_status
+from .rsvp_counts import rsvp_changed
+from .waitlist import promote_waitlist, release_rsvps
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ("title", "category", "date", "time", "organizer","approval_status")
+    list_display = ("title", "category", "date", "time", "organizer","approval_status", "capacity", "going_count", "waitlisted_count")
     list_filter = ("category", "date", "approval_status")
     search_fields = ("title", "description", "location")
     actions = ["approve_events", "reject_events"]
     @admin.action(description="Approve selected events")
     def approve_events(self, request, queryset):
-        updated = queryset.update(approval_status="approved")
-        self.message_user(request, f"{updated} event(s) approved.")
+        updated = set_approval_status(queryset, Event.STATUS_APPROVED)
+        self.message_user(request, f"{updated} event(s) approved; organizers will be notified.")
 
     @admin.action(description="Reject selected events")
     def reject_events(self, request, queryset):
-        updated = queryset.update(approval_status="rejected")
-        self.message_user(request, f"{updated} event(s) rejected.")
+        updated = set_approval_status(queryset, Event.STATUS_REJECTED)
+        self.message_user(request, f"{updated} event(s) rejected; organizers will be notified.")
 @admin.register(EventOrganizer)
 class EventOrganizerAdmin(admin.ModelAdmin):
     list_display = ("organization_name", "contact_email", "phone_number")
@@ -23,6 +27,38 @@ class EventOrganizerAdmin(admin.ModelAdmin):
 
 @admin.register(RSVP)
 class RSVPAdmin(admin.ModelAdmin):
-    list_display = ("event", "attendee", "status", "contact_email", "created_at")
+    list_display = ("event", "attendee", "status", "contact_email", "created_at", "waitlisted_at")
     list_filter = ("status", "created_at", "event")
-    search_fields = ("attendee__username", "attendee__email", "event__title", "contact_email")
\ No newline at end of file
+    search_fields = ("attendee__username", "attendee__email", "event__title", "contact_email")
+
+    # Keep Event.going_count and friends in step with admin edits
+
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        previous = form.initial if change else {}
+        super().save_model(request, obj, form, change)
+        if change and previous.get("event") != obj.event_id:
+            rsvp_changed(previous.get("event"), previous.get("status"), None)
+            rsvp_changed(obj.event_id, None, obj.status)
+        else:
+            rsvp_changed(obj.event_id, previous.get("status"), obj.status)
+
+        if previous.get("status") == RSVP.GOING and (
+            obj.status != RSVP.GOING or previous.get("event") != obj.event_id
+        ):
+            for event in Event.objects.filter(pk=previous.get("event")):
+                promote_waitlist(event)
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        release_rsvps(RSVP.objects.filter(pk=obj.pk))
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        release_rsvps(queryset)
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ("address", "found", "latitude", "longitude", "hits", "misses", "expires_at")
+    list_filter = ("found",)
+    search_fields = ("address", "formatted_address")
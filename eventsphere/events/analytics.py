@@ -0,0 +1,63 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .cache import get_organizer_analytics
+from .models import RSVP, Event
+
+ANALYTICS_DAYS = getattr(settings, "ORGANIZER_ANALYTICS_DAYS", 30)
+
+
+def organizer_analytics(organizer, days=ANALYTICS_DAYS):
+    """Cached build_organizer_analytics() for one organizer."""
+    return get_organizer_analytics(organizer.pk, days, lambda: build_organizer_analytics(organizer, days))
+
+
+def build_organizer_analytics(organizer, days=ANALYTICS_DAYS):
+    """
+    Per-event RSVP analytics for an organizer's events, in two queries: one aggregate
+    for the status counts and one grouped query over RSVP.created_at for new RSVPs
+    per local day over the last `days` days. Returns {"days", "events", "totals"}.
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    since = timezone.make_aware(datetime.combine(first_day, time.min))
+    status_counts = {
+        status: Count("rsvps", filter=Q(rsvps__status=status)) for status, _ in RSVP.STATUS_CHOICES
+    }
+    events = list(
+        Event.objects.filter(organizer=organizer)
+        .annotate(**status_counts)
+        .order_by("-date", "-id")
+        .values("id", "title", "date", "capacity", *status_counts)
+    )
+
+    per_day = {}
+    for row in (
+        RSVP.objects.filter(event__organizer=organizer, created_at__gte=since)
+        .annotate(day=TruncDate("created_at", tzinfo=timezone.get_current_timezone()))
+        .values("event_id", "day")
+        .annotate(n=Count("id"))
+        .order_by()
+    ):
+        per_day[row["event_id"], row["day"]] = row["n"]
+
+    day_list = [first_day + timedelta(days=i) for i in range(days)]
+    totals = {status: 0 for status in status_counts}
+    for event in events:
+        event["total"] = sum(event[status] for status in status_counts)
+        series = [per_day.get((event["id"], day), 0) for day in day_list]
+        peak = max(series) or 1
+        # Bar heights as a percentage of the event's busiest day, for the sparkline
+        event["series"] = [
+            {"day": day, "count": n, "height": round(n * 100 / peak)} for day, n in zip(day_list, series)
+        ]
+        event["recent"] = sum(series)
+        for status in status_counts:
+            totals[status] += event[status]
+    totals["total"] = sum(totals.values())
+
+    return {"days": days, "events": events, "totals": totals}
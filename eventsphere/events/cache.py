@@ -0,0 +1,109 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils import timezone
+
+def seconds_until_local_midnight():
+    now = timezone.localtime()
+    midnight = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), datetime.min.time()))
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+ROUTE_CACHE_GRID = getattr(settings, "TRAVEL_ROUTE_CACHE_GRID", 0.005)  # degrees, roughly 500 m
+ROUTE_CACHE_TTL = getattr(settings, "TRAVEL_ROUTE_CACHE_TTL", 60 * 60)
+# Route results outnumber every other key by far, so they get their own cache when one is
+# configured and can't push the version tokens below out of the default cache
+ROUTE_CACHE_ALIAS = getattr(settings, "TRAVEL_ROUTE_CACHE_ALIAS", "routes")
+
+
+def _route_cache():
+    return caches[ROUTE_CACHE_ALIAS] if ROUTE_CACHE_ALIAS in settings.CACHES else cache
+
+
+def route_cache_key(event, origin_lat, origin_lng, mode_value):
+    """
+    Key for one Routes API result. Origins are snapped to a ROUTE_CACHE_GRID grid so
+    nearby attendees share entries, and the event's own coordinates are part of the key
+    so moving the event invalidates every route cached for it.
+    """
+    return "route:{}:{:.6f},{:.6f}:{},{}:{}".format(
+        event.id,
+        float(event.latitude),
+        float(event.longitude),
+        round(origin_lat / ROUTE_CACHE_GRID),
+        round(origin_lng / ROUTE_CACHE_GRID),
+        mode_value,
+    )
+
+
+def get_cached_route(key):
+    return _route_cache().get(key)
+
+
+def set_cached_route(key, route):
+    _route_cache().set(key, route, ROUTE_CACHE_TTL)
+
+
+ATTENDEE_COUNT_TTL = getattr(settings, "ATTENDEE_COUNT_TTL", 10 * 60)
+
+
+def _attendee_version_key(event_id):
+    return f"event_attendees:version:{event_id}"
+
+
+def invalidate_attendee_cache(event_id):
+    """Drop the cached attendee search counts for one event; called on every RSVP write."""
+    cache.set(_attendee_version_key(event_id), time.time_ns(), None)
+
+
+def get_attendee_count(event_id, status, search, count):
+    """
+    Return the cached number of RSVPs matching a status/search filter on the attendee
+    table, calling count() on a miss. Entries are keyed on a per-event version token.
+    """
+    version = cache.get(_attendee_version_key(event_id))
+    if version is None:
+        version = time.time_ns()
+        cache.set(_attendee_version_key(event_id), version, None)
+    key = "event_attendees:count:{}:{}:{}:{}".format(
+        event_id, version, status, hashlib.sha1(search.lower().encode()).hexdigest()
+    )
+
+    total = cache.get(key)
+    if total is None:
+        total = count()
+        cache.set(key, total, ATTENDEE_COUNT_TTL)
+    return total
+
+
+ANALYTICS_CACHE_TTL = getattr(settings, "ORGANIZER_ANALYTICS_CACHE_TTL", 15 * 60)
+
+
+def _analytics_version_key(organizer_id):
+    return f"organizer_analytics:version:{organizer_id}"
+
+
+def invalidate_organizer_analytics(organizer_id):
+    """Drop one organizer's cached analytics; called on RSVP writes and event changes."""
+    cache.set(_analytics_version_key(organizer_id), time.time_ns(), None)
+
+
+def get_organizer_analytics(organizer_id, days, build):
+    """
+    Return the cached analytics for an organizer, calling build() on a miss. Keyed on
+    a per-organizer version token and the local date, since the day series moves at midnight.
+    """
+    version = cache.get(_analytics_version_key(organizer_id))
+    if version is None:
+        version = time.time_ns()
+        cache.set(_analytics_version_key(organizer_id), version, None)
+    key = f"organizer_analytics:{organizer_id}:{version}:{timezone.localdate().isoformat()}:{days}"
+
+    analytics = cache.get(key)
+    if analytics is None:
+        analytics = build()
+        cache.set(key, analytics, min(ANALYTICS_CACHE_TTL, seconds_until_local_midnight()))
+    return analytics
@@ -0,0 +1,59 @@
+"""Subjects and bodies for the emails EventSphere sends about events."""
+
+from .models import Event
+
+# Moderation results are sent from a no-reply address rather than DEFAULT_FROM_EMAIL
+MODERATION_FROM_EMAIL = "noreply@eventsphere.com"
+
+
+def reminder_email(event):
+    """(subject, body) for the reminder sent to an event's attendees."""
+    subject = f"Reminder: '{event.title}' is coming up"
+    message = (
+        f"Hello,\n\n"
+        f"This is a reminder for the event '{event.title}' that you RSVP'd to.\n\n"
+        f"Event details:\n"
+        f"- Date: {event.date}\n"
+        f"- Time: {event.time or 'TBA'}\n"
+        f"- Location: {event.location}, {event.city or ''}\n\n"
+        f"If you can no longer attend, you can update your RSVP in EventSphere.\n\n"
+        f"— EventSphere Team"
+    )
+    return subject, message
+
+
+def approval_status_email(event):
+    """(subject, body) telling the organizer their event was approved or rejected; None otherwise."""
+    if event.approval_status == Event.STATUS_APPROVED:
+        subject = f"Your event '{event.title}' has been approved!"
+        message = (
+            f"Congratulations! Your event '{event.title}' has been approved "
+            f"and is now visible on EventSphere.\n\n"
+            f"Event details:\nTitle: {event.title}\nDate: {event.date}\nLocation: {event.location}\n"
+        )
+    elif event.approval_status == Event.STATUS_REJECTED:
+        subject = f"Your event '{event.title}' has been rejected"
+        message = (
+            f"Unfortunately, your event '{event.title}' has been rejected.\n"
+            f"If you’d like more information, please contact the admin team.\n"
+        )
+    else:
+        return None  # No email for pending state
+    return subject, message
+
+
+def waitlist_promotion_email(event):
+    """(subject, body) telling a waitlisted attendee they now have a spot."""
+    subject = f"You're in: a spot opened up for '{event.title}'"
+    message = (
+        f"Hello,\n\n"
+        f"A spot opened up for '{event.title}' and you've been moved off the waitlist. "
+        f"Your RSVP is now Going.\n\n"
+        f"Event details:\n"
+        f"- Date: {event.date}\n"
+        f"- Time: {event.time or 'TBA'}\n"
+        f"- Location: {event.location}, {event.city or ''}\n\n"
+        f"If you can no longer attend, please update your RSVP so the next person can go.\n\n"
+        f"— EventSphere Team"
+    )
+    return subject, message
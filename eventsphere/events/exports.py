@@ -0,0 +1,66 @@
+import csv
+import zlib
+
+from django.conf import settings
+
+from .models import RSVP
+
+EXPORT_CHUNK_SIZE = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+# Compressed output is held back until this many bytes are ready, to avoid tiny chunks
+GZIP_FLUSH_BYTES = getattr(settings, "EXPORT_GZIP_FLUSH_BYTES", 64 * 1024)
+
+ATTENDEE_CSV_HEADER = [
+    "Attendee ID", "Username", "First name", "Last name",
+    "User email", "RSVP contact email", "RSVP status", "RSVP created_at",
+]
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of storing it, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def attendee_csv_rows(event, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the attendee CSV for `event` one encoded line at a time. Rows are read with
+    iterator(), so only chunk_size of them are in memory however big the event is.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(ATTENDEE_CSV_HEADER).encode()
+
+    rows = (
+        RSVP.objects.filter(event=event)
+        .order_by("id")
+        .values_list(
+            "attendee__id",
+            "attendee__username",
+            "attendee__first_name",
+            "attendee__last_name",
+            "attendee__email",
+            "contact_email",
+            "status",
+            "created_at",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        yield writer.writerow(row).encode()
+
+
+def gzip_chunks(chunks, flush_bytes=GZIP_FLUSH_BYTES):
+    """Gzip-compress a stream of byte chunks incrementally, yielding the compressed output as it grows."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)  # gzip container
+    pending = []
+    size = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            pending.append(data)
+            size += len(data)
+        if size >= flush_bytes:
+            yield b"".join(pending)
+            pending, size = [], 0
+    pending.append(compressor.flush())
+    yield b"".join(pending)
@@ -4,12 +4,15 @@ from .models import EventOrganizer, Event
 class EventOrganizerForm(forms.ModelForm):
     class Meta:
         model = EventOrganizer
-        fields = ['organization_name', 'contact_email', 'phone_number']
+        fields = ['organization_name', 'contact_email', 'phone_number', 'digest_opt_in']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for field in self.fields.values():
-            field.widget.attrs.update({'class': 'form-control'})
+            if isinstance(field.widget, forms.CheckboxInput):
+                field.widget.attrs.update({'class': 'form-check-input'})
+            else:
+                field.widget.attrs.update({'class': 'form-control'})
 
 class EventForm(forms.ModelForm):
     class Meta:
@@ -37,6 +40,9 @@ class EventForm(forms.ModelForm):
         }
 
 class EventFilterForm(forms.Form):
+    SORT_DATE = 'date'
+    SORT_DISTANCE = 'distance'
+
     category = forms.ChoiceField(
         choices=[('', 'All categories')] + list(Event.CATEGORY_CHOICES),
         required=False,
@@ -55,6 +61,12 @@ class EventFilterForm(forms.Form):
             label="Radius (km)",
             widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Enter radius in km'})
         )
+    sort = forms.ChoiceField(
+        choices=[(SORT_DATE, 'Soonest first'), (SORT_DISTANCE, 'Nearest first')],
+        required=False,
+        label="Sort by",
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
     user_lat = forms.FloatField(widget=forms.HiddenInput(), required=False)
     user_lng = forms.FloatField(widget=forms.HiddenInput(), required=False)
     def clean(self):
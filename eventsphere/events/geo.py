@@ -0,0 +1,172 @@
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the pure-Python loop
+    np = None
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+# Sorts after every base32 character, so [prefix, prefix + GEOHASH_UPPER) is a prefix range.
+GEOHASH_UPPER = "{"
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Return distance in km between two lat/lng points."""
+    R = EARTH_RADIUS_KM
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_phi / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+def distances_from(lat, lng, lats, lngs):
+    """
+    Return the distance in km from one origin to every (lats[i], lngs[i]) point.
+    Uses a single vectorized NumPy pass when NumPy is installed.
+    """
+    if np is not None:
+        phi1 = math.radians(lat)
+        phi2 = np.radians(np.asarray(lats, dtype=float))
+        delta_phi = phi2 - phi1
+        delta_lambda = np.radians(np.asarray(lngs, dtype=float)) - math.radians(lng)
+        a = np.sin(delta_phi / 2) ** 2 + \
+            math.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    phi1 = math.radians(lat)
+    cos_phi1 = math.cos(phi1)
+    lambda1 = math.radians(lng)
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+    distances = []
+    for point_lat, point_lng in zip(lats, lngs):
+        phi2 = radians(point_lat)
+        a = sin((phi2 - phi1) / 2) ** 2 + \
+            cos_phi1 * cos(phi2) * sin((radians(point_lng) - lambda1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * asin(sqrt(min(a, 1.0))))
+    return distances
+
+
+def nearest_indices(distances, radius_km=None, limit=None, sort=False):
+    """
+    Pick indices out of a distances_from() result.
+
+    radius_km drops points further away, sort orders the rest nearest first and
+    limit keeps only the N nearest (which implies sorting). Without sort or limit
+    the original order is kept.
+    """
+    if np is not None and isinstance(distances, np.ndarray):
+        indices = np.arange(len(distances))
+        if radius_km is not None:
+            indices = indices[distances[indices] <= radius_km]
+        if limit is not None and limit < len(indices):
+            nearest = np.argpartition(distances[indices], limit)[:limit]
+            indices = indices[nearest]
+        if sort or limit is not None:
+            indices = indices[np.argsort(distances[indices], kind="stable")]
+        return indices.tolist()
+
+    indices = range(len(distances))
+    if radius_km is not None:
+        indices = [i for i in indices if distances[i] <= radius_km]
+    if limit is not None:
+        return heapq.nsmallest(limit, indices, key=distances.__getitem__)
+    if sort:
+        return sorted(indices, key=distances.__getitem__)
+    return list(indices)
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    """Encode a lat/lng point as a base32 geohash string."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_cell_size(precision):
+    """Return (height, width) in degrees of a geohash cell at the given precision."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def geohash_precision_for_radius(lat, radius_km):
+    """
+    Longest geohash precision whose cells are still at least radius_km across,
+    so a radius search never spans more than 3x3 cells. Returns 0 when even a
+    single character is too fine.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = geohash_cell_size(candidate)
+        if height * KM_PER_DEGREE < radius_km or width * KM_PER_DEGREE * cos_lat < radius_km:
+            break
+        precision = candidate
+    return precision
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Return (min_lat, max_lat, min_lng, max_lng) enclosing a circle of radius_km.
+    The longitude bounds are None when the box reaches a pole or wraps the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    delta_lng = radius_km / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+    min_lng, max_lng = lng - delta_lng, lng + delta_lng
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def covering_geohashes(min_lat, max_lat, min_lng, max_lng, precision):
+    """Return the set of geohash prefixes of the given precision that cover a box."""
+    height, width = geohash_cell_size(precision)
+    cells = set()
+
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            cells.add(geohash_encode(lat, lng, precision))
+            if lng >= max_lng:
+                break
+            lng = min(lng + width, max_lng)
+        if lat >= max_lat:
+            break
+        lat = min(lat + height, max_lat)
+
+    return cells
@@ -0,0 +1,207 @@
+"""
+Shared outbound HTTP client for the Google APIs.
+
+All calls go through one keep-alive connection pool. Connection errors and 429/5xx
+responses are retried a bounded number of times with jittered backoff, and each
+upstream ("geocode", "routes", ...) has its own circuit breaker. Once an upstream
+fails repeatedly, calls fail fast with UpstreamUnavailable until a trial request
+succeeds. Per-upstream latency is recorded and available from upstream_stats().
+"""
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from django.conf import settings
+
+HTTP_POOL_SIZE = getattr(settings, "HTTP_POOL_SIZE", 16)
+HTTP_MAX_RETRIES = getattr(settings, "HTTP_MAX_RETRIES", 2)
+HTTP_BACKOFF_BASE = getattr(settings, "HTTP_BACKOFF_BASE", 0.2)  # seconds
+HTTP_BACKOFF_MAX = getattr(settings, "HTTP_BACKOFF_MAX", 2.0)
+BREAKER_FAILURE_THRESHOLD = getattr(settings, "HTTP_BREAKER_FAILURE_THRESHOLD", 5)
+BREAKER_RESET_TIMEOUT = getattr(settings, "HTTP_BREAKER_RESET_TIMEOUT", 30)  # seconds
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LATENCY_SAMPLES = 500
+
+
+class UpstreamUnavailable(requests.exceptions.RequestException):
+    """The upstream's circuit breaker is open, so the request was not sent."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures. After `reset_timeout` seconds one
+    trial request is let through; success closes the breaker, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the trial request already in flight
+            return False
+
+    def is_closed(self):
+        with self._lock:
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class LatencyStats:
+    """Request count, error count and recent latencies for one upstream."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.samples.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self.samples)
+            requests_, errors = self.requests, self.errors
+
+        def percentile(p):
+            return round(samples[min(int(len(samples) * p), len(samples) - 1)] * 1000, 1) if samples else None
+
+        return {
+            "requests": requests_,
+            "errors": errors,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1] * 1000, 1) if samples else None,
+        }
+
+
+_session = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+_registry_lock = threading.Lock()
+_breakers = {}
+_stats = defaultdict(LatencyStats)
+
+
+def breaker_for(upstream):
+    with _registry_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker()
+        return _breakers[upstream]
+
+
+def _stats_for(upstream):
+    with _registry_lock:
+        return _stats[upstream]
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+def request(upstream, method, url, retries=HTTP_MAX_RETRIES, **kwargs):
+    """
+    Send a request through the shared pool, on behalf of `upstream`.
+    Connection errors and RETRY_STATUSES responses are retried up to `retries` times.
+    Timeouts are not retried, since a slow upstream is the case where piling on more
+    requests hurts most. Raises UpstreamUnavailable when the breaker is open, and
+    requests exceptions when the last attempt fails to connect; otherwise returns the
+    final response, whatever its status. Retries stop early once the breaker opens.
+    """
+    breaker = breaker_for(upstream)
+    stats = _stats_for(upstream)
+
+    if not breaker.allow():
+        raise UpstreamUnavailable(f"{upstream} is temporarily unavailable")
+
+    for attempt in range(retries + 1):
+        started = time.monotonic()
+        try:
+            response = _session.request(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            stats.record(time.monotonic() - started, error=True)
+            breaker.record_failure()
+            raise
+        except requests.exceptions.ConnectionError:
+            stats.record(time.monotonic() - started, error=True)
+            breaker.record_failure()
+            if attempt == retries or not breaker.is_closed():
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        except requests.exceptions.RequestException:
+            stats.record(time.monotonic() - started, error=True)
+            breaker.record_failure()
+            raise
+
+        failed = response.status_code in RETRY_STATUSES
+        stats.record(time.monotonic() - started, error=failed)
+        if not failed:
+            breaker.record_success()
+            return response
+
+        breaker.record_failure()
+        # Stop retrying as soon as this failure opened the breaker
+        if attempt == retries or not breaker.is_closed():
+            return response
+        time.sleep(backoff_delay(attempt))
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, "GET", url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, "POST", url, **kwargs)
+
+
+def upstream_stats():
+    """{upstream: {"requests", "errors", "p50_ms", "p95_ms", "max_ms", "breaker"}} for this process."""
+    with _registry_lock:
+        upstreams = set(_stats) | set(_breakers)
+    return {
+        upstream: {**_stats_for(upstream).snapshot(), "breaker": breaker_for(upstream).state}
+        for upstream in sorted(upstreams)
+    }
+
+
+def reset():
+    """Forget all breaker state and latency stats, e.g. between benchmark runs."""
+    with _registry_lock:
+        _breakers.clear()
+        _stats.clear()
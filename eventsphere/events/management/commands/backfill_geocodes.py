@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from events.geo import geohash_encode
+from events.models import Event
+from events.utils import GeocodeUnavailable, RateLimiter, geocode_address
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode events that have no coordinates, in id order. "
+        "Safe to interrupt: rerun with --after-id to continue from the last reported id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent geocoding requests.")
+        parser.add_argument("--rps", type=float, default=10, help="Maximum requests per second (0 = unlimited).")
+        parser.add_argument("--chunk-size", type=int, default=200)
+        parser.add_argument("--after-id", type=int, default=0, help="Resume after this event id.")
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many events.")
+        parser.add_argument(
+            "--max-attempts", type=int, default=1,
+            help="Skip events that have already failed this many times.",
+        )
+
+    def handle(self, *args, **options):
+        limiter = RateLimiter(options["rps"])
+        chunk_size = options["chunk_size"]
+
+        candidates = (
+            Event.objects.filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+            .exclude(geocode_status=Event.GEOCODE_PENDING)  # the geocode_worker owns these
+            .filter(geocode_attempts__lt=options["max_attempts"])
+            .order_by("id")
+        )
+        total = candidates.filter(id__gt=options["after_id"]).count()
+        if options["limit"] is not None:
+            total = min(total, options["limit"])
+        if not total:
+            self.stdout.write("No events need geocoding.")
+            return
+        self.stdout.write(f"Geocoding {total} event(s) with {options['workers']} worker(s)")
+
+        def lookup(address):
+            """Geocode result for address, or None if the service was unavailable."""
+            limiter.wait()
+            try:
+                return geocode_address(address, raise_unavailable=True)
+            except GeocodeUnavailable as e:
+                print("Geocoding error:", e)
+                return None
+            finally:
+                # Worker threads get their own DB connection for the geocode cache
+                connection.close()
+
+        last_id = options["after_id"]
+        processed = found = unavailable = 0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while processed < total:
+                chunk = list(
+                    candidates.filter(id__gt=last_id)
+                    .only("id", "location", "city", "latitude", "longitude", "geocode_attempts")
+                    [:min(chunk_size, total - processed)]
+                )
+                if not chunk:
+                    break
+
+                results = pool.map(lookup, [event.full_address for event in chunk])
+                resolved = []
+                for event, result in zip(chunk, results):
+                    if result is None:
+                        # Says nothing about the address; leave the row for a later run
+                        unavailable += 1
+                        continue
+                    lat, lng, _ = result
+                    if lat is not None and lng is not None:
+                        event.latitude = lat
+                        event.longitude = lng
+                        event.geohash = geohash_encode(lat, lng)
+                        event.geocode_status = Event.GEOCODE_DONE
+                        found += 1
+                    else:
+                        event.geocode_status = Event.GEOCODE_FAILED
+                    event.geocode_attempts += 1
+                    resolved.append(event)
+
+                Event.objects.bulk_update(
+                    resolved,
+                    ["latitude", "longitude", "geohash", "geocode_status", "geocode_attempts"],
+                )
+
+                processed += len(chunk)
+                last_id = chunk[-1].id
+                elapsed = time.monotonic() - started
+                rate = processed / elapsed if elapsed else 0
+                eta = (total - processed) / rate if rate else 0
+                self.stdout.write(
+                    f"{processed}/{total} processed, {found} found, {unavailable} unavailable, "
+                    f"{rate:.1f} events/s, ETA {eta:.0f}s (last id {last_id})"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {found} of {processed} event(s) geocoded. Resume with --after-id {last_id}"
+        ))
+        if unavailable:
+            self.stdout.write(self.style.WARNING(
+                f"{unavailable} event(s) were skipped because the geocoding service was unavailable; "
+                "they were left unchanged, so rerun without --after-id to retry them."
+            ))
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from events import geo
+
+
+class Command(BaseCommand):
+    help = "Compare the scalar haversine loop with the batch distances_from() engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="1000,10000,100000",
+            help="Comma-separated event counts to benchmark (default: 1000,10000,100000).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per size; the best time is reported.")
+        parser.add_argument("--radius", type=float, default=50, help="Radius filter in km.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        origin_lat, origin_lng = 33.7490, -84.3880
+        radius_km = options["radius"]
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+
+        engine = "numpy" if geo.np is not None else "pure python"
+        self.stdout.write(f"Batch engine: {engine}, best of {options['repeat']} runs\n")
+        self.stdout.write(f"{'events':>8}  {'scalar ms':>10}  {'batch ms':>10}  {'top-50 ms':>10}  {'speedup':>8}")
+
+        for size in sizes:
+            lats = [origin_lat + rng.uniform(-2, 2) for _ in range(size)]
+            lngs = [origin_lng + rng.uniform(-2, 2) for _ in range(size)]
+
+            def scalar():
+                return [
+                    i for i in range(size)
+                    if geo.haversine(origin_lat, origin_lng, lats[i], lngs[i]) <= radius_km
+                ]
+
+            def batch():
+                distances = geo.distances_from(origin_lat, origin_lng, lats, lngs)
+                return geo.nearest_indices(distances, radius_km=radius_km)
+
+            def top_n():
+                distances = geo.distances_from(origin_lat, origin_lng, lats, lngs)
+                return geo.nearest_indices(distances, limit=50)
+
+            if sorted(scalar()) != sorted(batch()):
+                self.stderr.write(f"Result mismatch at {size} events")
+
+            scalar_ms = self._best(scalar, options["repeat"])
+            batch_ms = self._best(batch, options["repeat"])
+            top_n_ms = self._best(top_n, options["repeat"])
+            self.stdout.write(
+                f"{size:>8}  {scalar_ms:>10.2f}  {batch_ms:>10.2f}  {top_n_ms:>10.2f}  {scalar_ms / batch_ms:>7.1f}x"
+            )
+
+    @staticmethod
+    def _best(fn, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from events import http_client, travel
+from events.models import Event
+
+
+def _stub_handler(latencies):
+    class RoutesStub(BaseHTTPRequestHandler):
+        """Answers computeRoutes after the configured per-mode delay."""
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latencies.get(body["travelMode"], 0))
+            data = json.dumps({
+                "routes": [{"distanceMeters": 5000, "duration": "600s", "polyline": {"encodedPolyline": "_p~iF~ps|U"}}]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return RoutesStub
+
+
+class Command(BaseCommand):
+    help = "Time sequential vs concurrent travel_options Routes calls against a local stub with injected latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--latency", default="DRIVE=0.3,WALK=0.5,TRANSIT=1.2,BICYCLE=0.4",
+            help="Per-mode stub latency in seconds, e.g. DRIVE=0.3,TRANSIT=1.2",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        latencies = {}
+        for item in options["latency"].split(","):
+            mode, seconds = item.split("=")
+            latencies[mode.strip().upper()] = float(seconds)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _stub_handler(latencies))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stub_url = f"http://127.0.0.1:{server.server_port}/directions/v2:computeRoutes"
+
+        event = Event(latitude=33.7756, longitude=-84.3963)
+        origin_lat, origin_lng = 33.7490, -84.3880
+
+        def sequential():
+            for mode_value in travel.GOOGLE_MODES.values():
+                travel.fetch_route("stub", origin_lat, origin_lng, event.latitude, event.longitude, mode_value)
+
+        def concurrent():
+            travel.compute_travel_options(event, origin_lat, origin_lng, "stub", use_cache=False)
+
+        http_client.reset()
+        try:
+            with override_settings(GOOGLE_ROUTES_URL=stub_url):
+                sequential_s = self._best(sequential, options["repeat"])
+                concurrent_s = self._best(concurrent, options["repeat"])
+        finally:
+            server.shutdown()
+
+        self.stdout.write(f"Slowest single mode: {max(latencies.values()):.2f}s, sum of modes: {sum(latencies.values()):.2f}s")
+        self.stdout.write(f"Sequential:  {sequential_s:.2f}s")
+        self.stdout.write(f"Concurrent:  {concurrent_s:.2f}s")
+        for upstream, stats in http_client.upstream_stats().items():
+            self.stdout.write(
+                f"{upstream}: {stats['requests']} requests, {stats['errors']} errors, "
+                f"p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, breaker {stats['breaker']}"
+            )
+
+    @staticmethod
+    def _best(fn, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
@@ -0,0 +1,56 @@
+import json
+import math
+import random
+
+from django.core.management.base import BaseCommand
+
+from events import polyline, travel
+from events.models import Event
+
+
+def _synthetic_route(points, seed):
+    """A winding ~points*15 m route starting in midtown Atlanta, encoded like the Routes API does."""
+    rng = random.Random(seed)
+    lat, lng, heading = 33.7490, -84.3880, 0.0
+    coords = []
+    for _ in range(points):
+        heading += rng.uniform(-0.3, 0.3)
+        lat += 0.000135 * math.cos(heading)
+        lng += 0.000162 * math.sin(heading)
+        coords.append((lat, lng))
+    return polyline.encode(coords)
+
+
+class Command(BaseCommand):
+    help = "Compare travel_options JSON payload sizes for each detail level on a synthetic long route."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=3000, help="Points in the synthetic route polyline.")
+        parser.add_argument("--zoom", default="10,12,14,16", help="Comma-separated zoom levels to simplify for.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        encoded = _synthetic_route(options["points"], options["seed"])
+        route = {"distance_meters": options["points"] * 15, "duration": "2400s", "polyline": encoded}
+        origin_lat, origin_lng = 33.7490, -84.3880
+        event = Event(latitude=33.7756, longitude=-84.3963)
+
+        result = {
+            mode_key: travel.build_mode_option(mode_key, route, origin_lat, origin_lng, event)
+            for mode_key in travel.GOOGLE_MODES
+        }
+        travel.add_rideshare_options(result, origin_lat, origin_lng, event)
+
+        full_size = len(json.dumps(travel.trim_travel_options(result, travel.DETAIL_FULL)))
+        self.stdout.write(f"{'detail':<12} {'zoom':>4} {'points':>7} {'bytes':>8} {'of full':>8}")
+        self.stdout.write(f"{'full':<12} {'-':>4} {options['points']:>7} {full_size:>8} {'100%':>8}")
+
+        for zoom in [int(z) for z in options["zoom"].split(",")]:
+            for detail in (travel.DETAIL_SIMPLIFIED, travel.DETAIL_COMPACT):
+                trimmed = travel.trim_travel_options(result, detail, zoom)
+                size = len(json.dumps(trimmed))
+                kept = len(polyline.decode(trimmed["drive"]["polyline"]))
+                self.stdout.write(f"{detail:<12} {zoom:>4} {kept:>7} {size:>8} {size / full_size:>8.1%}")
+
+        size = len(json.dumps(travel.trim_travel_options(result, travel.DETAIL_NONE)))
+        self.stdout.write(f"{'none':<12} {'-':>4} {0:>7} {size:>8} {size / full_size:>8.1%}")
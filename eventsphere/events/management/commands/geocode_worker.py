@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.utils import GEOCODE_MAX_ATTEMPTS, geocode_pending_events
+
+
+class Command(BaseCommand):
+    help = "Resolve coordinates for events whose geocoding is pending."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to wait when the queue is drained.")
+        parser.add_argument("--max-attempts", type=int, default=GEOCODE_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--outage-delay", type=float, default=60,
+            help="Seconds to wait after the geocoding service is unavailable.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained instead of polling.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        while True:
+            resolved, failed, retrying, unavailable = geocode_pending_events(batch_size, options["max_attempts"])
+            if resolved or failed or retrying:
+                self.stdout.write(f"Geocoded {resolved}, failed {failed}, retrying later {retrying}")
+
+            if unavailable:
+                # The events are still pending with their attempts untouched
+                self.stdout.write(self.style.WARNING(
+                    f"Geocoding service unavailable; {unavailable} event(s) left pending"
+                ))
+                if options["once"]:
+                    break
+                time.sleep(options["outage_delay"])
+                continue
+
+            if resolved + failed + retrying < batch_size:
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event
+from events.rsvp_counts import recount_rsvps
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Event.going_count/interested_count/not_going_count from the RSVP table "
+        "and fix events whose counters drifted, e.g. after RSVPs were removed outside the app."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, action="append", help="Only this event id (repeatable).")
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted events without fixing them.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["event"]:
+            events = events.filter(pk__in=options["event"])
+
+        stale = recount_rsvps(events, dry_run=options["dry_run"])
+        verb = "would be fixed" if options["dry_run"] else "fixed"
+        self.stdout.write(f"{stale} event(s) with wrong RSVP counts {verb}.")
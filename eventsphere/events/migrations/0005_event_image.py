@@ -9,8 +9,10 @@ class Migration(migrations.Migration):
         ('events', '0004_event'),
     ]
 
+    # 0004_event already creates the image column; altering it keeps fresh databases
+    # (e.g. the test database) from failing with a duplicate column
     operations = [
-        migrations.AddField(
+        migrations.AlterField(
             model_name='event',
             name='image',
             field=models.ImageField(blank=True, null=True, upload_to='event_images/'),
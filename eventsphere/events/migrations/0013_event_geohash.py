@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+from events.geo import geohash_encode
+
+
+def backfill_geohash(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    events = list(
+        Event.objects.filter(latitude__isnull=False, longitude__isnull=False)
+        .only('id', 'latitude', 'longitude')
+    )
+    for event in events:
+        event.geohash = geohash_encode(event.latitude, event.longitude)
+    Event.objects.bulk_update(events, ['geohash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_city'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
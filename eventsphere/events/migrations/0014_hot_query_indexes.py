@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_event_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['approval_status', 'date', 'category'], name='event_status_date_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('approval_status', 'approved')), fields=['category', 'date'], name='event_approved_cat_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['attendee', 'status', '-created_at'], name='rsvp_attendee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', 'status'], name='rsvp_event_status_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:14
+
+from django.db import migrations, models
+
+
+def mark_existing_events(apps, schema_editor):
+    # Rows created before the worker existed were geocoded inline; the ones
+    # that still have no coordinates are left to the backfill, not the worker.
+    Event = apps.get_model('events', 'Event')
+    Event.objects.filter(latitude__isnull=False, longitude__isnull=False).update(geocode_status='done')
+    Event.objects.filter(geocode_status='pending').update(geocode_status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_geocodecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geocode_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='geocode_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_events, migrations.RunPython.noop),
+    ]
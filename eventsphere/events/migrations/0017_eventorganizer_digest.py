@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_event_geocode_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventorganizer',
+            name='digest_opt_in',
+            field=models.BooleanField(default=False, verbose_name='Send RSVP activity as a periodic digest instead of one email per RSVP'),
+        ),
+        migrations.AddField(
+            model_name='eventorganizer',
+            name='last_digest_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
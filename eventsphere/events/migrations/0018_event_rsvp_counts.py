@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_rsvp_counts(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    RSVP = apps.get_model('events', 'RSVP')
+
+    def counted(status):
+        return Coalesce(
+            Subquery(
+                RSVP.objects.filter(event=OuterRef('pk'), status=status)
+                .order_by().values('event').annotate(n=Count('id')).values('n')
+            ),
+            0,
+        )
+
+    Event.objects.update(
+        going_count=counted('going'),
+        interested_count=counted('interested'),
+        not_going_count=counted('not_going'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_eventorganizer_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='going_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='interested_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='not_going_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rsvp_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_event_rsvp_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='waitlisted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rsvp',
+            name='waitlisted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='rsvp',
+            name='status',
+            field=models.CharField(choices=[('going', 'Going'), ('interested', 'Interested'), ('not_going', 'Not going'), ('waitlisted', 'Waitlisted')], default='going', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', 'status', 'waitlisted_at'], name='rsvp_waitlist_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0019_rsvp_waitlist'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rsvp',
+            name='rsvp_event_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', '-created_at', '-id'], name='rsvp_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', 'status', '-created_at', '-id'], name='rsvp_event_status_created_idx'),
+        ),
+    ]
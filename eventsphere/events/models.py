@@ -6,6 +6,13 @@ from django.contrib import admin
 from urllib.parse import urlencode
 from datetime import datetime, timedelta
 import pytz
+from .geo import (
+    GEOHASH_UPPER,
+    bounding_box,
+    covering_geohashes,
+    geohash_encode,
+    geohash_precision_for_radius,
+)
 
 # Create your models here.
 
@@ -14,10 +21,37 @@ class EventOrganizer(models.Model):
     organization_name = models.CharField(max_length=255)
     contact_email = models.EmailField(blank=True, default='')
     phone_number = models.CharField(max_length=20, blank=True, default='')
+    digest_opt_in = models.BooleanField(
+        default=False,
+        verbose_name="Send RSVP activity as a periodic digest instead of one email per RSVP",
+    )
+    last_digest_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.organization_name} ({self.profile.user.username})"
 
+class EventQuerySet(models.QuerySet):
+    def near(self, lat, lng, radius_km):
+        """
+        Narrow to events that can lie within radius_km of (lat, lng), using the
+        geohash column and a lat/lng bounding box. Callers still need an exact
+        distance check on the rows that come back.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        qs = self.filter(latitude__range=(min_lat, max_lat))
+        if min_lng is None:
+            return qs
+        qs = qs.filter(longitude__range=(min_lng, max_lng))
+
+        precision = geohash_precision_for_radius(lat, radius_km)
+        if not precision:
+            return qs
+
+        cells = models.Q()
+        for prefix in covering_geohashes(min_lat, max_lat, min_lng, max_lng, precision):
+            cells |= models.Q(geohash__gte=prefix, geohash__lt=prefix + GEOHASH_UPPER)
+        return qs.filter(cells)
+
 class Event(models.Model):
     STATUS_PENDING = "pending"
     STATUS_APPROVED = "approved"
@@ -45,6 +79,16 @@ class Event(models.Model):
         (CHARITIES, "Charitable"), 
         (OTHER, "Other"),
     ]
+
+    GEOCODE_PENDING = "pending"
+    GEOCODE_DONE = "done"
+    GEOCODE_FAILED = "failed"
+
+    GEOCODE_STATUS_CHOICES = [
+        (GEOCODE_PENDING, "Pending"),
+        (GEOCODE_DONE, "Done"),
+        (GEOCODE_FAILED, "Failed"),
+    ]
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default=OTHER)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -52,6 +96,16 @@ class Event(models.Model):
     city = models.CharField(max_length=100, blank=True, null=True)
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True, editable=False)
+    geocode_status = models.CharField(
+        max_length=10,
+        choices=GEOCODE_STATUS_CHOICES,
+        default=GEOCODE_PENDING,
+        db_index=True,
+    )
+    geocode_attempts = models.PositiveSmallIntegerField(default=0)
+    # Set while a geocode worker holds the row; see geocode_pending_events
+    geocode_claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
     date = models.DateField()
     time = models.TimeField(null=True, blank=True)
     price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
@@ -70,8 +124,133 @@ class Event(models.Model):
         choices=STATUS_CHOICES,
         default=STATUS_PENDING,
     )
+    # Denormalized RSVP totals, maintained with F() updates by events.rsvp_counts
+    going_count = models.PositiveIntegerField(default=0, editable=False)
+    interested_count = models.PositiveIntegerField(default=0, editable=False)
+    not_going_count = models.PositiveIntegerField(default=0, editable=False)
+    waitlisted_count = models.PositiveIntegerField(default=0, editable=False)
+
+    RSVP_COUNT_FIELDS = ("going_count", "interested_count", "not_going_count", "waitlisted_count")
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # events_map: approved + upcoming + optional category
+            models.Index(
+                fields=["approval_status", "date", "category"],
+                name="event_status_date_cat_idx",
+            ),
+            # Smaller variant for backends with partial index support (skipped elsewhere)
+            models.Index(
+                fields=["category", "date"],
+                name="event_approved_cat_date_idx",
+                condition=models.Q(approval_status="approved"),
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot of the loaded row, keyed by attname; deferred fields are left out
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        deferred = self.get_deferred_fields()
+        if not {"latitude", "longitude"} & deferred:
+            if self.latitude is not None and self.longitude is not None:
+                self.geohash = geohash_encode(self.latitude, self.longitude)
+            else:
+                self.geohash = None
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # Never write the RSVP counters back from a possibly stale instance;
+            # they only change through F() updates. Deferred fields are left alone too.
+            update_fields = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.RSVP_COUNT_FIELDS and f.attname not in deferred
+            ]
+            kwargs["update_fields"] = update_fields
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"geohash"}
+
+        super().save(*args, **kwargs)
+        self._snapshot(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot(fields)
+
+    def _snapshot(self, fields=None):
+        """Record the current values of `fields` (all concrete fields by default) as saved."""
+        snapshot = self.__dict__.setdefault("_loaded_values", {})
+        names = set(fields) if fields is not None else None
+        for field in self._meta.concrete_fields:
+            if names is None or field.name in names or field.attname in names:
+                if field.attname in self.__dict__:
+                    snapshot[field.attname] = field.get_prep_value(getattr(self, field.attname))
+
+    def previous_value(self, name):
+        """
+        The value of field `name` as last loaded from or saved to the database.
+        Only falls back to a query when the field wasn't loaded with this instance,
+        e.g. it was deferred or the Event was built by hand. None for unsaved events.
+        """
+        attname = self._meta.get_field(name).attname
+        snapshot = self.__dict__.setdefault("_loaded_values", {})
+        if attname not in snapshot and self.pk is not None:
+            missing = [f.attname for f in self._meta.concrete_fields if f.attname not in snapshot]
+            row = type(self)._base_manager.filter(pk=self.pk).values(*missing).first()
+            if row is None:
+                return None
+            snapshot.update(row)
+        return snapshot.get(attname)
+
+    def changed_fields(self):
+        """Names of the fields whose current value differs from previous_value()."""
+        if self.pk is None:
+            return set()
+        changed = set()
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred and never assigned
+            previous = field.get_prep_value(self.previous_value(field.name))
+            if field.get_prep_value(getattr(self, field.attname)) != previous:
+                changed.add(field.name)
+        return changed
+
+    @property
+    def full_address(self):
+        # Combine location and city for better geocoding
+        return f"{self.location}, {self.city}" if self.city else self.location
+
+    def request_geocode(self):
+        """Clear the coordinates and queue the event for the geocode worker."""
+        self.latitude = None
+        self.longitude = None
+        self.geocode_status = self.GEOCODE_PENDING
+        self.geocode_attempts = 0
+        # Drops any in-flight worker result for the old address
+        self.geocode_claimed_at = None
+
+    @property
+    def rsvp_total(self):
+        return self.going_count + self.interested_count + self.not_going_count + self.waitlisted_count
+
+    @property
+    def seats_left(self):
+        """Open spots, or None when the event has no capacity limit."""
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.going_count, 0)
+
     @property
     def is_upcoming(self):
         return self.date > timezone.localdate()
@@ -114,11 +293,20 @@ class RSVP(models.Model):
     GOING = "going"
     INTERESTED = "interested"
     NOT_GOING = "not_going"
+    WAITLISTED = "waitlisted"
     STATUS_CHOICES = [
         (GOING, "Going"),
         (INTERESTED, "Interested"),
         (NOT_GOING, "Not going"),
+        (WAITLISTED, "Waitlisted"),
     ]
+    # Event column holding the number of RSVPs in each status
+    COUNT_FIELDS = {
+        GOING: "going_count",
+        INTERESTED: "interested_count",
+        NOT_GOING: "not_going_count",
+        WAITLISTED: "waitlisted_count",
+    }
 
     event = models.ForeignKey("Event", on_delete=models.CASCADE, related_name="rsvps")
     attendee = models.ForeignKey(
@@ -127,9 +315,40 @@ class RSVP(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=GOING)
     contact_email = models.EmailField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    # When the RSVP joined the waitlist; promotion is first come, first served
+    waitlisted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ("event", "attendee")
+        indexes = [
+            # attendee_my_events: attendee + status, newest first
+            models.Index(
+                fields=["attendee", "status", "-created_at"],
+                name="rsvp_attendee_status_idx",
+            ),
+            # event_attendees: keyset pages on (created_at, id), with and without a status filter.
+            # The status variant also serves event_send_reminder / edit_event notifications
+            models.Index(fields=["event", "-created_at", "-id"], name="rsvp_event_created_idx"),
+            models.Index(fields=["event", "status", "-created_at", "-id"], name="rsvp_event_status_created_idx"),
+            # promote_waitlist: oldest waitlisted RSVP first
+            models.Index(fields=["event", "status", "waitlisted_at"], name="rsvp_waitlist_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.attendee} → {self.event} ({self.status})"
+
+class GeocodeCache(models.Model):
+    """Stored results of geocode_address, keyed on the normalized address string."""
+    address_key = models.CharField(max_length=64, unique=True)
+    address = models.TextField()
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    formatted_address = models.CharField(max_length=255, blank=True, default='')
+    found = models.BooleanField(default=True)
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.attendee} → {self.event} ({self.status})"
\ No newline at end of file
+        return self.address
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import transaction
+
+from notifications.utils import enqueue_emails
+
+from .cache import invalidate_organizer_analytics
+from .emails import MODERATION_FROM_EMAIL, approval_status_email
+from .models import Event
+
+MODERATION_CHUNK_SIZE = getattr(settings, "MODERATION_CHUNK_SIZE", 500)
+
+
+def set_approval_status(queryset, status, chunk_size=MODERATION_CHUNK_SIZE):
+    """
+    Move every event in `queryset` to `status` and queue the same organizer email the
+    pre_save signal sends for a single save. Works in chunks of chunk_size: per chunk
+    one SELECT of the events with their organizers, one UPDATE and one bulk INSERT into
+    the outbox, all in one transaction. The bulk UPDATE skips the post_save signal, so
+    each affected organizer's cached analytics are dropped here once the chunk commits.
+    Events already in `status` are left alone.
+    Returns the number of events changed.
+    """
+    ids = list(queryset.exclude(approval_status=status).order_by("pk").values_list("pk", flat=True))
+    changed = 0
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        with transaction.atomic():
+            events = list(
+                Event.objects.select_for_update(of=("self",))
+                .filter(pk__in=chunk)
+                .exclude(approval_status=status)
+                .select_related("organizer")
+                .only("title", "date", "location", "approval_status", "organizer__email")
+            )
+            if not events:
+                continue
+            Event.objects.filter(pk__in=[e.pk for e in events]).update(approval_status=status)
+
+            messages = []
+            for event in events:
+                event.approval_status = status
+                email = approval_status_email(event)
+                if email is not None:
+                    messages.append((*email, [event.organizer.email]))
+            enqueue_emails(messages, from_email=MODERATION_FROM_EMAIL)
+        for organizer_id in {event.organizer_id for event in events}:
+            invalidate_organizer_analytics(organizer_id)
+        changed += len(events)
+
+    return changed
@@ -0,0 +1,104 @@
+"""Google encoded polyline helpers: decode, encode and Douglas-Peucker simplification."""
+
+# Simplification tolerance, in screen pixels at the requested zoom level
+POLYLINE_TOLERANCE_PX = 1.0
+
+
+def decode(encoded):
+    """Decode a Google encoded polyline into a list of (lat, lng) tuples."""
+    points = []
+    index = lat = lng = 0
+    length = len(encoded)
+
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append((lat / 1e5, lng / 1e5))
+
+    return points
+
+
+def _encode_value(value, out):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode(points):
+    """Encode a sequence of (lat, lng) pairs as a Google polyline string."""
+    out = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        lat_e5, lng_e5 = round(lat * 1e5), round(lng * 1e5)
+        _encode_value(lat_e5 - prev_lat, out)
+        _encode_value(lng_e5 - prev_lng, out)
+        prev_lat, prev_lng = lat_e5, lng_e5
+    return "".join(out)
+
+
+def tolerance_for_zoom(zoom, pixels=POLYLINE_TOLERANCE_PX):
+    """Degrees covered by `pixels` screen pixels at a Google Maps zoom level (256px tiles)."""
+    return pixels * 360.0 / (256 * 2 ** zoom)
+
+
+def simplify(points, tolerance):
+    """
+    Douglas-Peucker simplification of (lat, lng) points, keeping every point that is
+    more than `tolerance` degrees from the simplified line. Iterative, so long routes
+    don't hit the recursion limit.
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        segment_sq = dx * dx + dy * dy
+
+        max_dist_sq = 0.0
+        max_index = first
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if segment_sq:
+                t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / segment_sq))
+                ex, ey = px - (ax + t * dx), py - (ay + t * dy)
+            else:
+                ex, ey = px - ax, py - ay
+            dist_sq = ex * ex + ey * ey
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                max_index = i
+
+        if max_dist_sq > tolerance_sq:
+            keep[max_index] = True
+            stack.append((first, max_index))
+            stack.append((max_index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_encoded(encoded, zoom):
+    """Simplify an encoded polyline for display at `zoom` and re-encode it."""
+    if not encoded:
+        return encoded
+    return encode(simplify(decode(encoded), tolerance_for_zoom(zoom)))
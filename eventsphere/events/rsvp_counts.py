@@ -0,0 +1,97 @@
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import RSVP, Event
+
+
+def _apply(event_id, deltas):
+    """Add `deltas` ({status: change}) to one event's counters in a single UPDATE."""
+    updates = {}
+    for status, delta in deltas.items():
+        field = RSVP.COUNT_FIELDS.get(status)
+        if field and delta:
+            # Clamped at zero so a drifted counter can't break the unsigned column
+            updates[field] = Greatest(F(field) + delta, 0)
+    if updates:
+        Event.objects.filter(pk=event_id).update(**updates)
+
+
+def rsvp_changed(event_id, old_status, new_status):
+    """
+    Move one RSVP between counters. old_status is None for a new RSVP and new_status
+    is None for a deleted one. Call it in the transaction that writes the RSVP.
+    """
+    if old_status == new_status:
+        return
+    deltas = Counter()
+    if old_status:
+        deltas[old_status] -= 1
+    if new_status:
+        deltas[new_status] += 1
+    _apply(event_id, deltas)
+
+
+def rsvps_deleted(queryset):
+    """
+    Delete the RSVPs in `queryset` and take them off their events' counters, with one
+    grouped query to find what is removed and one UPDATE per affected event.
+    Returns {event_id: Counter of status -> change}.
+    """
+    per_event = {}
+    for row in queryset.values("event_id", "status").annotate(n=Count("id")).order_by():
+        per_event.setdefault(row["event_id"], Counter())[row["status"]] -= row["n"]
+    queryset.delete()
+    for event_id, deltas in per_event.items():
+        _apply(event_id, deltas)
+    return per_event
+
+
+def counted_rsvps(status):
+    """Correlated subquery counting an event's RSVPs in `status`, for use in update()."""
+    return Coalesce(
+        Subquery(
+            RSVP.objects.filter(event=OuterRef("pk"), status=status)
+            .order_by()
+            .values("event")
+            .annotate(n=Count("id"))
+            .values("n")
+        ),
+        0,
+    )
+
+
+def recount_rsvps(events=None, dry_run=False, chunk_size=500):
+    """
+    Recompute the counters from the RSVP table in one grouped query and fix the events
+    that drifted. Fixes are written as UPDATEs that count in the database, so an RSVP
+    arriving meanwhile isn't overwritten by a stale total. Returns the number of
+    events whose counters were wrong.
+    """
+    events = Event.objects.all() if events is None else events
+    actual = {
+        row["event_id"]: row
+        for row in (
+            RSVP.objects.filter(event__in=events)
+            .values("event_id")
+            .annotate(**{
+                field: Count("id", filter=Q(status=status))
+                for status, field in RSVP.COUNT_FIELDS.items()
+            })
+            .order_by()
+        )
+    }
+
+    stale = [
+        row["pk"]
+        for row in events.values("pk", *Event.RSVP_COUNT_FIELDS).iterator(chunk_size=2000)
+        if any(row[field] != actual.get(row["pk"], {}).get(field, 0) for field in Event.RSVP_COUNT_FIELDS)
+    ]
+
+    if not dry_run:
+        for start in range(0, len(stale), chunk_size):
+            Event.objects.filter(pk__in=stale[start:start + chunk_size]).update(**{
+                field: counted_rsvps(status) for status, field in RSVP.COUNT_FIELDS.items()
+            })
+    return len(stale)
@@ -1,43 +1,44 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from .models import Event
+from notifications.utils import enqueue_email
+from .models import RSVP, Event
+from .cache import invalidate_attendee_cache, invalidate_organizer_analytics
+from .emails import MODERATION_FROM_EMAIL, approval_status_email
 
 @receiver(pre_save, sender=Event)
 def notify_organizer_on_status_change(sender, instance, **kwargs):
     if not instance.pk:
         # It's a new event, skip notification
         return
+    if "approval_status" in instance.get_deferred_fields():
+        # Not loaded, so this save can't be changing it
+        return
     
-    try:
-        previous = Event.objects.get(pk=instance.pk)
-    except Event.DoesNotExist:
+    # Compared against the snapshot taken when the event was loaded, not a fresh SELECT
+    previous_status = instance.previous_value("approval_status")
+    if previous_status is None:
         return
 
-    if previous.approval_status != instance.approval_status:
-        subject = ""
-        message = ""
+    if previous_status != instance.approval_status:
+        email = approval_status_email(instance)
+        if email is not None:
+            enqueue_email(*email, [instance.organizer.email], from_email=MODERATION_FROM_EMAIL)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_analytics_on_event_change(sender, instance, **kwargs):
+    invalidate_organizer_analytics(instance.organizer_id)
+
 
-        if instance.approval_status == Event.STATUS_APPROVED:
-            subject = f"Your event '{instance.title}' has been approved!"
-            message = (
-                f"Congratulations! Your event '{instance.title}' has been approved "
-                f"and is now visible on EventSphere.\n\n"
-                f"Event details:\nTitle: {instance.title}\nDate: {instance.date}\nLocation: {instance.location}\n"
-            )
-        elif instance.approval_status == Event.STATUS_REJECTED:
-            subject = f"Your event '{instance.title}' has been rejected"
-            message = (
-                f"Unfortunately, your event '{instance.title}' has been rejected.\n"
-                f"If you’d like more information, please contact the admin team.\n"
-            )
-        else:
-            return  # No email for pending state
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def invalidate_attendee_cache_on_rsvp_change(sender, instance, **kwargs):
+    invalidate_attendee_cache(instance.event_id)
 
-        send_mail(
-            subject,
-            message,
-            "noreply@eventsphere.com",
-            [instance.organizer.email],
-            fail_silently=True,
-        )
+    if RSVP.event.is_cached(instance):
+        organizer_id = instance.event.organizer_id
+    else:
+        organizer_id = Event.objects.filter(pk=instance.event_id).values_list("organizer_id", flat=True).first()
+    if organizer_id is not None:
+        invalidate_organizer_analytics(organizer_id)
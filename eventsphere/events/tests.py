@@ -1,3 +1,491 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import random
+import threading
+import time
+import unittest
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import travel, waitlist
+from .cache import get_cached_route, get_organizer_analytics, set_cached_route
+from .forms import EventFilterForm, EventForm
+from .management.commands.benchmark_travel_payload import _synthetic_route
+from .models import RSVP, Event
+from .moderation import set_approval_status
+from notifications.models import FanoutJob
+from .utils import geocode_pending_events
+from .views import MAP_LIST_PAGE_SIZE, TRAVEL_OPTIONS_BATCH_LIMIT, _map_events_queryset
+from .waitlist import place_rsvp, release_rsvps
+
+
+def geocode_response(payload):
+    """Stand-in for the http_client response to a Geocoding API request."""
+    return mock.Mock(json=mock.Mock(return_value=payload))
+
+
+GEOCODE_FOUND = {
+    "status": "OK",
+    "results": [{"geometry": {"location": {"lat": 33.749, "lng": -84.388}}, "formatted_address": "Atlanta, GA"}],
+}
+GEOCODE_ZERO_RESULTS = {"status": "ZERO_RESULTS", "results": []}
+GEOCODE_OVER_QUERY_LIMIT = {"status": "OVER_QUERY_LIMIT", "results": []}
+
+
+def make_event(organizer, **fields):
+    defaults = {
+        "title": "Event",
+        "location": "1 Main St",
+        "date": timezone.localdate() + datetime.timedelta(days=7),
+        "organizer": organizer,
+        "approval_status": Event.STATUS_APPROVED,
+    }
+    defaults.update(fields)
+    return Event.objects.create(**defaults)
+
+
+class GeocodeWorkerTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user("organizer", "organizer@example.com")
+
+    def pending_event(self, location):
+        return make_event(self.organizer, location=location, geocode_status=Event.GEOCODE_PENDING)
+
+    def test_outage_leaves_events_pending_without_using_attempts(self):
+        events = [self.pending_event(f"{i} Outage Ave") for i in range(3)]
+
+        with mock.patch("events.http_client.get", return_value=geocode_response(GEOCODE_OVER_QUERY_LIMIT)) as get:
+            for _ in range(3):
+                self.assertEqual(geocode_pending_events(batch_size=10), (0, 0, 0, 3))
+
+        # The batch stops at the first error rather than trying every address
+        self.assertEqual(get.call_count, 3)
+        for event in events:
+            event.refresh_from_db()
+            self.assertEqual(event.geocode_status, Event.GEOCODE_PENDING)
+            self.assertEqual(event.geocode_attempts, 0)
+            self.assertIsNone(event.geocode_claimed_at)
+
+    def test_connection_error_is_an_outage(self):
+        event = self.pending_event("1 Timeout Rd")
+
+        with mock.patch("events.http_client.get", side_effect=ConnectionError("timed out")):
+            self.assertEqual(geocode_pending_events(), (0, 0, 0, 1))
+
+        event.refresh_from_db()
+        self.assertEqual((event.geocode_status, event.geocode_attempts), (Event.GEOCODE_PENDING, 0))
+
+    def test_resolves_after_outage(self):
+        event = self.pending_event("1 Peachtree St")
+
+        with mock.patch("events.http_client.get", return_value=geocode_response(GEOCODE_OVER_QUERY_LIMIT)):
+            geocode_pending_events()
+        with mock.patch("events.http_client.get", return_value=geocode_response(GEOCODE_FOUND)):
+            self.assertEqual(geocode_pending_events(), (1, 0, 0, 0))
+
+        event.refresh_from_db()
+        self.assertEqual(event.geocode_status, Event.GEOCODE_DONE)
+        self.assertAlmostEqual(float(event.latitude), 33.749)
+        self.assertIsNotNone(event.geohash)
+
+    def test_no_match_uses_an_attempt(self):
+        event = self.pending_event("Nowhere")
+
+        with mock.patch("events.http_client.get", return_value=geocode_response(GEOCODE_ZERO_RESULTS)):
+            self.assertEqual(geocode_pending_events(max_attempts=1), (0, 1, 0, 0))
+
+        event.refresh_from_db()
+        self.assertEqual((event.geocode_status, event.geocode_attempts), (Event.GEOCODE_FAILED, 1))
+
+
+class PlaceRSVPTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user("organizer", "organizer@example.com")
+        self.event = make_event(organizer, capacity=1)
+        self.attendee = User.objects.create_user("attendee", "attendee@example.com")
+
+    def test_simultaneous_first_rsvp_becomes_an_update(self):
+        with transaction.atomic():
+            place_rsvp(self.event, self.attendee, RSVP.GOING)
+
+        # The second request looked before the first one's row existed
+        locked_rsvp = waitlist._locked_rsvp
+        with mock.patch.object(waitlist, "_locked_rsvp", side_effect=[None, locked_rsvp(self.event, self.attendee)]):
+            with transaction.atomic():
+                rsvp, created, previous_status = place_rsvp(self.event, self.attendee, RSVP.INTERESTED)
+
+        self.assertFalse(created)
+        self.assertEqual(previous_status, RSVP.GOING)
+        self.assertEqual(RSVP.objects.filter(event=self.event).count(), 1)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.going_count, self.event.interested_count), (0, 1))
+
+
+class CapacityConcurrencyTests(TransactionTestCase):
+    """Simultaneous RSVPs and cancellations from threads, each with its own connection."""
+
+    ATTENDEES = 40
+    CAPACITY = 10
+    THREADS = 8
+
+    def setUp(self):
+        organizer = User.objects.create_user("organizer", "organizer@example.com")
+        self.event = make_event(organizer, capacity=self.CAPACITY)
+        self.attendees = [
+            User.objects.create_user(f"attendee{i}", f"attendee{i}@example.com") for i in range(self.ATTENDEES)
+        ]
+
+    def run_concurrently(self, tasks):
+        """Run each task in its own transaction across THREADS threads, started together."""
+        pending = list(tasks)
+        lock = threading.Lock()
+        errors = []
+        start_gate = threading.Barrier(self.THREADS)
+
+        def worker():
+            start_gate.wait()
+            try:
+                while True:
+                    with lock:
+                        if not pending:
+                            return
+                        task = pending.pop(0)
+                    for attempt in range(200):
+                        try:
+                            with transaction.atomic():
+                                task()
+                            break
+                        except OperationalError:
+                            # SQLite allows one writer at a time; back off and try again
+                            time.sleep(random.uniform(0, min(0.05, 0.001 * 2 ** attempt)))
+                    else:
+                        errors.append(task)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def assertCountersMatch(self):
+        self.event.refresh_from_db()
+        going = RSVP.objects.filter(event=self.event, status=RSVP.GOING).count()
+        waitlisted = RSVP.objects.filter(event=self.event, status=RSVP.WAITLISTED).count()
+        self.assertLessEqual(going, self.CAPACITY)
+        self.assertEqual((self.event.going_count, self.event.waitlisted_count), (going, waitlisted))
+        return going, waitlisted
+
+    def test_burst_never_oversells_and_promotes_in_order(self):
+        self.run_concurrently(
+            lambda attendee=attendee: place_rsvp(self.event, attendee, RSVP.GOING) for attendee in self.attendees
+        )
+        self.assertEqual(self.assertCountersMatch(), (self.CAPACITY, self.ATTENDEES - self.CAPACITY))
+
+        queue = list(
+            RSVP.objects.filter(event=self.event, status=RSVP.WAITLISTED)
+            .order_by("waitlisted_at", "id").values_list("pk", flat=True)
+        )
+        cancelled = list(
+            RSVP.objects.filter(event=self.event, status=RSVP.GOING).values_list("pk", flat=True)[:4]
+        )
+        self.run_concurrently(
+            lambda pk=pk: release_rsvps(RSVP.objects.filter(pk=pk)) for pk in cancelled
+        )
+        self.assertEqual(self.assertCountersMatch(), (self.CAPACITY, self.ATTENDEES - self.CAPACITY - 4))
+
+        promoted = set(RSVP.objects.filter(pk__in=queue, status=RSVP.GOING).values_list("pk", flat=True))
+        self.assertEqual(promoted, set(queue[:4]))
+
+
+class MapMarkersTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user("organizer", "organizer@example.com")
+        for title, lat, lng in [
+            ("downtown", 33.749, -84.388),
+            ("midtown", 33.781, -84.383),
+            ("macon", 32.840, -83.632),
+            ("chattanooga", 35.046, -85.309),
+        ]:
+            make_event(organizer, title=title, latitude=lat, longitude=lng, geocode_status=Event.GEOCODE_DONE)
+
+    def markers(self, **params):
+        bounds = {"north": 36, "south": 32, "east": -83, "west": -86, "zoom": 14}
+        return self.client.get(reverse("events_map_markers"), {**bounds, **params}).json()
+
+    def test_viewport_is_filtered_in_the_query(self):
+        with self.assertNumQueries(1):
+            data = self.markers(north=34, south=33.5)
+        self.assertEqual({event["title"] for event in data["events"]}, {"downtown", "midtown"})
+
+    def test_radius_search_limits_markers(self):
+        data = self.markers(lat=33.749, lng=-84.388, radius=10)
+        self.assertEqual({event["title"] for event in data["events"]}, {"downtown", "midtown"})
+
+        data = self.markers(lat=33.749, lng=-84.388, radius=150)
+        self.assertEqual({event["title"] for event in data["events"]}, {"downtown", "midtown", "macon"})
+
+    def test_radius_search_limits_clusters(self):
+        data = self.markers(zoom=5, lat=33.749, lng=-84.388, radius=10)
+        self.assertEqual(data["total"], 2)
+
+
+class MapTravelSummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("organizer", "organizer@example.com")
+        make_event(self.user, latitude=33.749, longitude=-84.388, geocode_status=Event.GEOCODE_DONE)
+
+    def test_list_page_fits_in_one_batch_request(self):
+        self.assertLessEqual(MAP_LIST_PAGE_SIZE, TRAVEL_OPTIONS_BATCH_LIMIT)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("events_map"))
+        self.assertContains(response, 'id="travel-summaries-btn"', count=1)
+
+    def test_batch_endpoint_requires_login(self):
+        response = self.client.get(reverse("travel_options_batch"), {"event_ids": "1", "origin_lat": 1, "origin_lng": 1})
+        self.assertEqual(response.status_code, 302)
+
+
+class RouteCacheTests(TestCase):
+    def test_routes_use_their_own_cache(self):
+        set_cached_route("route:test", {"duration": "5 min"})
+
+        self.assertEqual(get_cached_route("route:test"), {"duration": "5 min"})
+        self.assertEqual(caches["routes"].get("route:test"), {"duration": "5 min"})
+        self.assertIsNone(cache.get("route:test"))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class IndexUsageTests(TestCase):
+    """The hot queries should be answered from the indexes added for them, not a table scan."""
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+    def map_list_plan(self, **filters):
+        # The queryset events_map pages through when there is no radius search
+        queryset = _map_events_queryset(EventFilterForm(filters or None))
+        return self.query_plan(
+            queryset.filter(latitude__isnull=False, longitude__isnull=False)[:MAP_LIST_PAGE_SIZE]
+        )
+
+    def test_map_list_uses_status_date_index(self):
+        self.assertIn("event_status_date_cat_idx", self.map_list_plan())
+
+    def test_map_list_by_category_uses_partial_index(self):
+        self.assertIn("event_approved_cat_date_idx", self.map_list_plan(category="music"))
+
+    def test_attendee_my_events_uses_attendee_status_index(self):
+        attendee = User.objects.create_user("attendee", "attendee@example.com")
+        plan = self.query_plan(
+            RSVP.objects.select_related("event")
+            .filter(attendee=attendee, status__in=(RSVP.GOING, RSVP.WAITLISTED))
+            .order_by("-created_at")
+        )
+        self.assertIn("rsvp_attendee_status_idx", plan)
+
+
+class BackfillGeocodesTests(TransactionTestCase):
+    """backfill_geocodes geocodes from a thread pool, so this can't run inside one test transaction."""
+
+    RESPONSES = {
+        "found": GEOCODE_FOUND,
+        "nowhere": GEOCODE_ZERO_RESULTS,
+        "busy": GEOCODE_OVER_QUERY_LIMIT,
+    }
+
+    def setUp(self):
+        self.organizer = User.objects.create_user("organizer", "organizer@example.com")
+
+    def fake_get(self, upstream, url, params=None, **kwargs):
+        if params["address"].startswith("down"):
+            raise ConnectionError("geocoder unreachable")
+        return geocode_response(self.RESPONSES[params["address"].split()[0]])
+
+    def backfill(self, *args):
+        out = io.StringIO()
+        with mock.patch("events.http_client.get", side_effect=self.fake_get):
+            call_command("backfill_geocodes", "--rps", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_found_and_missing_addresses(self):
+        found = make_event(self.organizer, location="found 1 Main St", geocode_status=Event.GEOCODE_FAILED)
+        missing = make_event(self.organizer, location="nowhere at all", geocode_status=Event.GEOCODE_FAILED)
+
+        output = self.backfill()
+
+        found.refresh_from_db()
+        self.assertEqual((found.geocode_status, found.geocode_attempts), (Event.GEOCODE_DONE, 1))
+        self.assertIsNotNone(found.geohash)
+        # ZERO_RESULTS is a real miss and uses up the attempt
+        missing.refresh_from_db()
+        self.assertEqual((missing.geocode_status, missing.geocode_attempts), (Event.GEOCODE_FAILED, 1))
+        self.assertIsNone(missing.latitude)
+        self.assertIn("Done: 1 of 2 event(s) geocoded", output)
+
+    def test_outage_leaves_events_untouched(self):
+        busy = make_event(self.organizer, location="busy 1 Main St", geocode_status=Event.GEOCODE_FAILED)
+        down = make_event(self.organizer, location="down 2 Main St", geocode_status=Event.GEOCODE_FAILED)
+        found = make_event(self.organizer, location="found 3 Main St", geocode_status=Event.GEOCODE_FAILED)
+
+        output = self.backfill("--chunk-size", "2")
+
+        for event in (busy, down):
+            event.refresh_from_db()
+            self.assertEqual((event.geocode_status, event.geocode_attempts), (Event.GEOCODE_FAILED, 0))
+        found.refresh_from_db()
+        self.assertEqual(found.geocode_status, Event.GEOCODE_DONE)
+        self.assertIn("2 event(s) were skipped because the geocoding service was unavailable", output)
+
+        # Untouched, so a fresh run picks them up again
+        self.assertIn("Geocoding 2 event(s)", self.backfill())
+
+
+class TravelPayloadSizeTests(TestCase):
+    """Size of the travel_options payload per detail level for a long (3000-point) route."""
+
+    def setUp(self):
+        route = {"distance_meters": 45000, "duration": "2400s", "polyline": _synthetic_route(3000, seed=1)}
+        event = Event(latitude=33.7756, longitude=-84.3963)
+        self.result = {
+            mode_key: travel.build_mode_option(mode_key, route, 33.7490, -84.3880, event)
+            for mode_key in travel.GOOGLE_MODES
+        }
+        travel.add_rideshare_options(self.result, 33.7490, -84.3880, event)
+        for option in self.result.values():
+            option["cache_hit"] = True
+        self.full_size = self.size(travel.DETAIL_FULL)
+
+    def size(self, detail, zoom=travel.DEFAULT_POLYLINE_ZOOM):
+        return len(json.dumps(travel.trim_travel_options(self.result, detail, zoom)))
+
+    def test_simplified_and_compact_are_a_fraction_of_full(self):
+        self.assertLess(self.size(travel.DETAIL_SIMPLIFIED), self.full_size * 0.25)
+        self.assertLess(self.size(travel.DETAIL_COMPACT), self.full_size * 0.20)
+        self.assertLess(self.size(travel.DETAIL_NONE), self.full_size * 0.15)
+
+    def test_compact_is_smaller_than_simplified(self):
+        self.assertLess(self.size(travel.DETAIL_COMPACT), self.size(travel.DETAIL_SIMPLIFIED))
+
+    def test_cache_hit_survives_every_detail_level(self):
+        for detail in travel.DETAIL_LEVELS:
+            trimmed = travel.trim_travel_options(self.result, detail)
+            for mode_key, option in trimmed.items():
+                self.assertIs(option.get("cache_hit"), True, f"{detail}/{mode_key}")
+
+
+class QueryCountTests(TestCase):
+    """Query counts for the views whose N+1s and re-SELECTs were removed; none should grow with the data."""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user("organizer", "organizer@example.com")
+        self.event = make_event(self.organizer, capacity=2)
+        for i, status in enumerate([RSVP.GOING, RSVP.INTERESTED, RSVP.GOING, RSVP.GOING, RSVP.INTERESTED]):
+            attendee = User.objects.create_user(f"attendee{i}", f"attendee{i}@example.com")
+            with transaction.atomic():
+                place_rsvp(self.event, attendee, status)
+        self.client.force_login(self.organizer)
+
+    def event_selects(self, queries):
+        return [q["sql"] for q in queries if q["sql"].startswith("SELECT") and 'FROM "events_event"' in q["sql"]]
+
+    def test_edit_event(self):
+        data = {
+            name: value for name, value in EventForm(instance=self.event).initial.items()
+            if value is not None and name != "image"
+        }
+        data.update(title="Renamed", notify_attendees="on")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("edit_event", args=[self.event.id]), data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(queries), 15, "\n".join(q["sql"] for q in queries))
+        # The old values come from the load-time snapshot, not a second SELECT
+        self.assertEqual(len(self.event_selects(queries)), 1)
+
+    def test_approve_does_not_reselect_the_event(self):
+        event = Event.objects.select_related("organizer").get(pk=self.event.pk)
+        event.approval_status = Event.STATUS_REJECTED
+
+        with CaptureQueriesContext(connection) as queries:
+            event.save()
+
+        self.assertEqual(len(queries), 7, "\n".join(q["sql"] for q in queries))
+        self.assertEqual(self.event_selects(queries), [])
+
+    def attendee_page(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("event_attendees", args=[self.event.id]), params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_event_attendees_pages_cost_the_same(self):
+        with mock.patch("events.views.ATTENDEES_PAGE_SIZE", 2):
+            response, first = self.attendee_page()
+            self.assertEqual(first, 5)
+
+            older = QueryDict(response.context["older_query"]).dict()
+            response, second = self.attendee_page(**older)
+            self.assertEqual(second, first)
+
+            newer = QueryDict(response.context["newer_query"]).dict()
+            self.assertEqual(self.attendee_page(**newer)[1], first)
+
+    def test_my_events_does_not_grow_with_events_or_jobs(self):
+        def my_events_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("my_events"))
+            return len(queries)
+
+        FanoutJob.objects.create(event=self.event, kind=FanoutJob.KIND_REMINDER, subject="Subject", body="Body", total=1)
+        baseline = my_events_queries()
+        self.assertEqual(baseline, 5)
+
+        for i in range(3):
+            event = make_event(self.organizer, title=f"Event {i}")
+            for kind in (FanoutJob.KIND_REMINDER, FanoutJob.KIND_UPDATE):
+                FanoutJob.objects.create(event=event, kind=kind, subject="Subject", body="Body", total=1)
+        self.assertEqual(my_events_queries(), baseline)
+
+
+class BulkModerationTests(TestCase):
+    def test_drops_cached_analytics_of_affected_organizers(self):
+        organizers = [User.objects.create_user(f"organizer{i}", f"organizer{i}@example.com") for i in range(3)]
+        for organizer in organizers[:2]:
+            make_event(organizer, approval_status=Event.STATUS_PENDING)
+            make_event(organizer, approval_status=Event.STATUS_PENDING)
+        make_event(organizers[2], approval_status=Event.STATUS_PENDING)
+
+        def analytics(organizer):
+            return get_organizer_analytics(organizer.id, 30, lambda: builds.append(organizer) or organizer.id)
+
+        builds = []
+        for organizer in organizers:
+            analytics(organizer)
+
+        # The bulk UPDATE bypasses post_save, so set_approval_status has to invalidate itself
+        queryset = Event.objects.filter(organizer__in=organizers[:2])
+        self.assertEqual(set_approval_status(queryset, Event.STATUS_APPROVED, chunk_size=3), 4)
+
+        builds.clear()
+        for organizer in organizers:
+            analytics(organizer)
+        self.assertEqual(builds, organizers[:2])
@@ -0,0 +1,455 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+import requests
+from django.conf import settings
+
+from . import http_client
+from .cache import get_cached_route, route_cache_key, set_cached_route
+from .geo import haversine
+from .polyline import simplify_encoded
+
+# Google Routes API travel modes, in the order they are shown
+GOOGLE_MODES = {
+    "drive": "DRIVE",
+    "walk": "WALK",
+    "transit": "TRANSIT",
+    "bicycle": "BICYCLE"
+}
+
+# mode key -> (display name, icon, Google Maps deep link travelmode)
+MODE_DETAILS = {
+    "drive": ("Drive", "🚗", "driving"),
+    "walk": ("Walk", "🚶", "walking"),
+    "transit": ("Public Transit", "🚌", "transit"),
+    "bicycle": ("Bike", "🚴", "bicycling"),
+}
+
+ROUTES_FIELD_MASK = "routes.distanceMeters,routes.duration,routes.polyline.encodedPolyline"
+
+# Response detail levels for travel_options:
+#   full        - everything, with the Routes API polyline as returned
+#   simplified  - polylines reduced with Douglas-Peucker for the requested map zoom
+#   compact     - simplified polylines, without fields the client can derive from the mode key
+#                 and distance_meters
+#   none        - full fields, no route geometry
+DETAIL_FULL = "full"
+DETAIL_SIMPLIFIED = "simplified"
+DETAIL_COMPACT = "compact"
+DETAIL_NONE = "none"
+DETAIL_LEVELS = (DETAIL_FULL, DETAIL_SIMPLIFIED, DETAIL_COMPACT, DETAIL_NONE)
+DEFAULT_POLYLINE_ZOOM = 12
+
+COMPACT_DROP_FIELDS = ("distance", "distance_miles", "mode", "mode_display", "icon", "parking")
+
+# Used for the instant straight-line estimate sent before real routes arrive
+ROAD_DETOUR_FACTOR = 1.3  # typical road distance / great-circle distance in cities
+ESTIMATE_DRIVE_SPEED_KMH = 35
+
+TRAVEL_OPTIONS_WORKERS = getattr(settings, "TRAVEL_OPTIONS_WORKERS", 16)
+
+# Shared by all requests so the per-mode calls run side by side without spawning threads each time
+_route_pool = ThreadPoolExecutor(
+    max_workers=TRAVEL_OPTIONS_WORKERS,
+    thread_name_prefix="travel-routes",
+)
+
+
+def parse_duration(duration_str):
+    """Parse duration string like '514s' into human-readable format."""
+    if not duration_str:
+        return "Unknown"
+    
+    match = re.match(r'(\d+)s?$', str(duration_str))
+    if match:
+        total_seconds = int(match.group(1))
+        hours = total_seconds // 3600
+        minutes = (total_seconds % 3600) // 60
+        
+        if hours > 0:
+            return f"{hours}h {minutes}min"
+        elif minutes > 0:
+            return f"{minutes} min"
+        else:
+            return f"{total_seconds} sec"
+    
+    return str(duration_str)
+
+
+def estimate_gas_cost(distance_meters):
+    """Estimate gas cost for driving."""
+    if distance_meters == 0:
+        return {"formatted": "Free", "amount": 0}
+    
+    distance_miles = distance_meters / 1609.34
+    mpg = 25  # Average fuel efficiency
+    gas_price = 3.50  # Average gas price per gallon
+    cost = distance_miles / mpg * gas_price
+    
+    return {
+        "formatted": f"${cost:.2f}",
+        "amount": round(cost, 2)
+    }
+
+
+def estimate_uber_cost(distance_meters):
+    """Estimate Uber cost based on distance."""
+    if distance_meters == 0:
+        return {"formatted": "N/A", "amount": 0}
+    
+    distance_miles = distance_meters / 1609.34
+    
+    # Uber pricing: base + per mile + booking fee + surge estimate
+    base_fare = 2.50
+    per_mile = 1.75
+    booking_fee = 2.75
+    
+    total = base_fare + (distance_miles * per_mile) + booking_fee
+    
+    return {
+        "formatted": f"${total:.2f}",
+        "amount": round(total, 2),
+        "range": f"${total*.9:.2f} - ${total*1.3:.2f}"  # Show range for surge
+    }
+
+
+def estimate_lyft_cost(distance_meters):
+    """Estimate Lyft cost (similar to Uber)."""
+    if distance_meters == 0:
+        return {"formatted": "N/A", "amount": 0}
+    
+    distance_miles = distance_meters / 1609.34
+    
+    # Lyft pricing (slightly different from Uber)
+    base_fare = 2.00
+    per_mile = 1.65
+    service_fee = 3.00
+    
+    total = base_fare + (distance_miles * per_mile) + service_fee
+    
+    return {
+        "formatted": f"${total:.2f}",
+        "amount": round(total, 2),
+        "range": f"${total*.9:.2f} - ${total*1.3:.2f}"
+    }
+
+
+def estimate_transit_cost():
+    """Standard transit fare."""
+    return {
+        "formatted": "$2.75",
+        "amount": 2.75,
+        "note": "Single ride fare"
+    }
+
+
+def get_parking_info(event_lat, event_lng):
+    """Get basic parking information near event location."""
+    # This is a placeholder - you could integrate with parking APIs
+    # For now, return generic info
+    return {
+        "available": True,
+        "estimated_cost": "$10-25",
+        "note": "Street and lot parking available nearby"
+    }
+
+
+def routes_url():
+    return getattr(settings, "GOOGLE_ROUTES_URL", "https://routes.googleapis.com/directions/v2:computeRoutes")
+
+
+def travel_deadline():
+    """Seconds travel_options waits for the Routes API before giving up on the remaining modes."""
+    return getattr(settings, "TRAVEL_OPTIONS_DEADLINE", 10)
+
+
+def fetch_route(api_key, origin_lat, origin_lng, dest_lat, dest_lng, mode_value):
+    """
+    Ask the Routes API for one travel mode.
+    Returns {"distance_meters", "duration", "polyline"} or {"error": message}.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "X-Goog-Api-Key": api_key,
+        "X-Goog-FieldMask": ROUTES_FIELD_MASK
+    }
+    body = {
+        "origin": {"location": {"latLng": {"latitude": origin_lat, "longitude": origin_lng}}},
+        "destination": {"location": {"latLng": {"latitude": dest_lat, "longitude": dest_lng}}},
+        "travelMode": mode_value
+    }
+    if mode_value == "DRIVE":
+        body["routingPreference"] = "TRAFFIC_AWARE_OPTIMAL"
+
+    try:
+        response = http_client.post("routes", routes_url(), headers=headers, json=body, timeout=10)
+
+        if response.status_code != 200:
+            error_data = response.json() if response.content else {}
+            return {"error": error_data.get("error", {}).get("message", f"HTTP {response.status_code}")}
+
+        data = response.json()
+        if "routes" not in data or not data["routes"]:
+            return {"error": "No route found"}
+
+        route = data["routes"][0]
+        return {
+            "distance_meters": route.get("distanceMeters", 0),
+            "duration": route.get("duration", ""),
+            "polyline": route.get("polyline", {}).get("encodedPolyline", ""),
+        }
+    except http_client.UpstreamUnavailable:
+        return {"error": "Routing service temporarily unavailable"}
+    except requests.exceptions.Timeout:
+        return {"error": "Request timed out"}
+    except requests.exceptions.RequestException as e:
+        return {"error": f"Connection error: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Error: {str(e)}"}
+
+
+def build_mode_option(mode_key, route, origin_lat, origin_lng, event):
+    """Turn a fetch_route() result into the travel_options entry for one mode."""
+    if "error" in route:
+        return {
+            "available": False,
+            "error": route["error"]
+        }
+
+    distance_m = route["distance_meters"]
+    duration_str = route["duration"]
+    distance_mi = distance_m / 1609.34
+    if distance_m > 0:
+        distance_km = distance_m / 1000
+        distance_display = f"{distance_km:.1f} km ({distance_mi:.1f} mi)"
+    else:
+        distance_display = "Very close"
+
+    mode_display, icon, deep_link_mode = MODE_DETAILS[mode_key]
+    option = {
+        "available": True,
+        "distance": distance_display,
+        "distance_meters": distance_m,
+        "distance_miles": distance_mi,
+        "duration": parse_duration(duration_str),
+        "duration_seconds": int(duration_str.replace('s', '')) if duration_str else 0,
+        "polyline": route["polyline"],
+        "mode": GOOGLE_MODES[mode_key],
+        "mode_display": mode_display,
+        "icon": icon,
+        "deep_link": f"https://www.google.com/maps/dir/?api=1&origin={origin_lat},{origin_lng}&destination={event.latitude},{event.longitude}&travelmode={deep_link_mode}"
+    }
+
+    # Add mode-specific details
+    if mode_key == "drive":
+        option["gas_cost"] = estimate_gas_cost(distance_m)
+        option["parking"] = get_parking_info(event.latitude, event.longitude)
+    elif mode_key == "transit":
+        option["cost"] = estimate_transit_cost()
+    else:
+        option["cost"] = {"formatted": "Free", "amount": 0}
+
+    return option
+
+
+def add_rideshare_options(travel_options_result, origin_lat, origin_lng, event):
+    """Add Uber/Lyft estimates based on the driving route, if there is one."""
+    drive = travel_options_result.get('drive')
+    if not drive or not drive.get('available'):
+        travel_options_result['uber'] = {
+            "available": False,
+            "error": "Driving route not available"
+        }
+        travel_options_result['lyft'] = {
+            "available": False,
+            "error": "Driving route not available"
+        }
+        return
+
+    drive_distance = drive.get('distance_meters', 0)
+    drive_duration = drive.get('duration', 'Unknown')
+    drive_cache_hit = drive.get('cache_hit', False)
+
+    # Uber - use web link that works on all devices
+    travel_options_result['uber'] = {
+        "available": True,
+        "distance": drive['distance'],
+        "distance_meters": drive_distance,
+        "distance_miles": drive.get('distance_miles', 0),
+        "duration": drive_duration,
+        "cost": estimate_uber_cost(drive_distance),
+        "mode": "UBER",
+        "mode_display": "Uber",
+        "icon": "🚕",
+        "cache_hit": drive_cache_hit,
+        "deep_link": f"https://m.uber.com/ul/?action=setPickup&pickup[latitude]={origin_lat}&pickup[longitude]={origin_lng}&dropoff[latitude]={event.latitude}&dropoff[longitude]={event.longitude}"
+    }
+
+    # Lyft - use web link that works on all devices
+    travel_options_result['lyft'] = {
+        "available": True,
+        "distance": drive['distance'],
+        "distance_meters": drive_distance,
+        "distance_miles": drive.get('distance_miles', 0),
+        "duration": drive_duration,
+        "cost": estimate_lyft_cost(drive_distance),
+        "mode": "LYFT",
+        "mode_display": "Lyft",
+        "icon": "🚖",
+        "cache_hit": drive_cache_hit,
+        "deep_link": f"https://lyft.com/ride?id=lyft&pickup[latitude]={origin_lat}&pickup[longitude]={origin_lng}&destination[latitude]={event.latitude}&destination[longitude]={event.longitude}"
+    }
+
+
+def trim_option(option, detail, zoom=DEFAULT_POLYLINE_ZOOM):
+    """Return a copy of one travel_options entry reduced to the given detail level."""
+    if detail == DETAIL_FULL or not option.get("available"):
+        return option
+
+    option = dict(option)
+    if detail == DETAIL_NONE:
+        option.pop("polyline", None)
+        return option
+
+    if option.get("polyline"):
+        option["polyline"] = simplify_encoded(option["polyline"], zoom)
+    if detail == DETAIL_COMPACT:
+        for field in COMPACT_DROP_FIELDS:
+            option.pop(field, None)
+    return option
+
+
+def trim_travel_options(travel_options_result, detail, zoom=DEFAULT_POLYLINE_ZOOM):
+    return {key: trim_option(option, detail, zoom) for key, option in travel_options_result.items()}
+
+
+def straight_line_estimate(event, origin_lat, origin_lng):
+    """
+    Rough drive/Uber/Lyft options from the great-circle distance alone, so a client
+    has something to show before the Routes API answers. Entries carry "estimate": True.
+    """
+    distance_m = haversine(origin_lat, origin_lng, float(event.latitude), float(event.longitude)) * 1000
+    distance_m *= ROAD_DETOUR_FACTOR
+    distance_mi = distance_m / 1609.34
+    seconds = int(distance_m / 1000 / ESTIMATE_DRIVE_SPEED_KMH * 3600)
+
+    drive = build_mode_option(
+        "drive",
+        {"distance_meters": int(distance_m), "duration": f"{seconds}s", "polyline": ""},
+        origin_lat, origin_lng, event,
+    )
+    drive["distance"] = f"~{distance_m / 1000:.1f} km (~{distance_mi:.1f} mi)"
+    drive["duration"] = "~" + drive["duration"]
+
+    result = {"drive": drive}
+    add_rideshare_options(result, origin_lat, origin_lng, event)
+    for option in result.values():
+        option["estimate"] = True
+    return result
+
+
+def iter_travel_options(event, origin_lat, origin_lng, api_key, deadline=None, use_cache=True):
+    """
+    Yield (mode_key, option) pairs as each travel mode becomes available: cached modes
+    first, then Routes API results in the order they complete. Uber and Lyft follow the
+    drive result; modes still outstanding at the deadline are yielded as timed out.
+    """
+    if deadline is None:
+        deadline = travel_deadline()
+    dest_lat, dest_lng = float(event.latitude), float(event.longitude)
+
+    def finish(mode_key, route, cache_hit):
+        option = build_mode_option(mode_key, route, origin_lat, origin_lng, event)
+        option["cache_hit"] = cache_hit and "error" not in route
+        yield mode_key, option
+        if mode_key == "drive":
+            rideshare = {"drive": option}
+            add_rideshare_options(rideshare, origin_lat, origin_lng, event)
+            yield "uber", rideshare["uber"]
+            yield "lyft", rideshare["lyft"]
+
+    futures = {}
+    cache_keys = {}
+    for mode_key, mode_value in GOOGLE_MODES.items():
+        if use_cache:
+            cache_keys[mode_key] = route_cache_key(event, origin_lat, origin_lng, mode_value)
+            cached = get_cached_route(cache_keys[mode_key])
+            if cached is not None:
+                yield from finish(mode_key, cached, True)
+                continue
+        future = _route_pool.submit(fetch_route, api_key, origin_lat, origin_lng, dest_lat, dest_lng, mode_value)
+        futures[future] = mode_key
+
+    try:
+        for future in as_completed(list(futures), timeout=deadline):
+            mode_key = futures.pop(future)
+            route = future.result()
+            if use_cache and "error" not in route:
+                set_cached_route(cache_keys[mode_key], route)
+            yield from finish(mode_key, route, False)
+    except FuturesTimeout:
+        for mode_key in list(futures.values()):
+            yield from finish(mode_key, {"error": "Request timed out"}, False)
+    finally:
+        # Also reached when the client disconnects mid-stream
+        for future in futures:
+            future.cancel()
+
+
+def compute_travel_options_many(events, origin_lat, origin_lng, api_key, deadline=None, use_cache=True):
+    """
+    Build the travel_options map for several events from one origin.
+    Every (event, mode) lookup that is not in the route cache runs concurrently
+    under a single deadline; lookups still outstanding when it passes are
+    reported as timed out. Each mode reports whether it was a cache hit.
+    Returns {event.id: travel_options_result}.
+    """
+    if deadline is None:
+        deadline = travel_deadline()
+
+    routes = {}
+    cache_keys = {}
+    futures = {}
+    for event in events:
+        dest_lat, dest_lng = float(event.latitude), float(event.longitude)
+        for mode_key, mode_value in GOOGLE_MODES.items():
+            slot = (event.id, mode_key)
+            if use_cache:
+                cache_keys[slot] = route_cache_key(event, origin_lat, origin_lng, mode_value)
+                cached = get_cached_route(cache_keys[slot])
+                if cached is not None:
+                    routes[slot] = cached
+                    continue
+            future = _route_pool.submit(fetch_route, api_key, origin_lat, origin_lng, dest_lat, dest_lng, mode_value)
+            futures[future] = slot
+
+    done, _ = wait(futures, timeout=deadline)
+
+    fetched = set()
+    for future, slot in futures.items():
+        if future in done:
+            routes[slot] = future.result()
+            fetched.add(slot)
+            if use_cache and "error" not in routes[slot]:
+                set_cached_route(cache_keys[slot], routes[slot])
+        else:
+            future.cancel()
+            routes[slot] = {"error": "Request timed out"}
+
+    results = {}
+    for event in events:
+        travel_options_result = {}
+        for mode_key in GOOGLE_MODES:
+            route = routes[(event.id, mode_key)]
+            option = build_mode_option(mode_key, route, origin_lat, origin_lng, event)
+            option["cache_hit"] = (event.id, mode_key) not in fetched and "error" not in route
+            travel_options_result[mode_key] = option
+        add_rideshare_options(travel_options_result, origin_lat, origin_lng, event)
+        results[event.id] = travel_options_result
+    return results
+
+
+def compute_travel_options(event, origin_lat, origin_lng, api_key, deadline=None, use_cache=True):
+    """Request every Google travel mode for one event concurrently; see compute_travel_options_many."""
+    return compute_travel_options_many([event], origin_lat, origin_lng, api_key, deadline, use_cache)[event.id]
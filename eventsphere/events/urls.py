@@ -5,13 +5,17 @@ urlpatterns = [
     path('dashboard/', organizer_dashboard, name='organizer_dashboard'),
     path('create/', views.create_event, name='create_event'),
     path('my-events/', views.my_events, name='my_events'),
+    path('my-events/analytics/', views.organizer_analytics_view, name='organizer_analytics'),
     path('edit/<int:event_id>/', views.edit_event, name='edit_event'),
     path('delete/<int:event_id>/', views.delete_event, name='delete_event'),
     path('map/', events_map, name='events_map'),
+    path('map/markers/', views.events_map_markers, name='events_map_markers'),
     path("<int:event_id>/attendees/", views.event_attendees, name="event_attendees"),
     path("<int:event_id>/attendees/export/", views.event_attendees_export_csv, name="event_attendees_export_csv"),
     path("<int:event_id>/rsvp/", views.rsvp_event, name="rsvp_event"),
     path('<int:event_id>/', views.event_detail, name='event_detail'),
     path('<int:event_id>/travel-options/', views.travel_options, name='travel_options'),
+    path('<int:event_id>/travel-options/stream/', views.travel_options_stream, name='travel_options_stream'),
+    path('travel-options/batch/', views.travel_options_batch, name='travel_options_batch'),
      path('attendees/<int:event_id>/remind/', views.event_send_reminder, name='event_send_reminder'),
 ]
\ No newline at end of file
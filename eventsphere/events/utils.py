@@ -1,22 +1,212 @@
-import requests
+import hashlib
+import re
+import threading
+import time
+from datetime import timedelta
+
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
-def geocode_address(address):
-    if not address:
-        return None, None, None
+from . import http_client
+from .geo import geohash_encode
+from .models import Event, GeocodeCache
+
+GEOCODE_CACHE_TTL = getattr(settings, "GEOCODE_CACHE_TTL", timedelta(days=30))
+GEOCODE_NEGATIVE_CACHE_TTL = getattr(settings, "GEOCODE_NEGATIVE_CACHE_TTL", timedelta(days=1))
+GEOCODE_MAX_ATTEMPTS = getattr(settings, "GEOCODE_MAX_ATTEMPTS", 3)
+GEOCODE_RETRY_DELAY = getattr(settings, "GEOCODE_RETRY_DELAY", timedelta(minutes=5))
+# How long a claimed event stays hidden from other workers; also covers a worker crashing mid-batch
+GEOCODE_CLAIM_LEASE = getattr(settings, "GEOCODE_CLAIM_LEASE", timedelta(minutes=10))
+GOOGLE_GEOCODE_URL = getattr(settings, "GOOGLE_GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+
+
+class GeocodeUnavailable(Exception):
+    """The geocoding service could not be reached or returned an error; the result is unknown."""
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart, shared across threads. A rate of 0 disables it."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
+
+def normalize_address(address):
+    """Lowercase and collapse whitespace/comma spacing so equivalent strings share a cache entry."""
+    address = re.sub(r"\s+", " ", address.strip().lower())
+    return re.sub(r"\s*,\s*", ", ", address).strip(" ,")
+
+
+def _geocode_remote(address):
+    """Ask Google for (lat, lng, formatted_address); (None, None, None) means no match."""
     api_key = settings.GOOGLE_MAPS_API_KEY
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
+    url = GOOGLE_GEOCODE_URL
     params = {"address": address, "key": api_key}
 
     try:
-        response = requests.get(url, params=params, timeout=5).json()
-        if response.get("results"):
-            result = response["results"][0]
-            location = result["geometry"]["location"]
-            formatted_address = result.get("formatted_address", address)
-            return location["lat"], location["lng"], formatted_address
+        response = http_client.get("geocode", url, params=params, timeout=5).json()
     except Exception as e:
-        print("Geocoding error:", e)
+        raise GeocodeUnavailable(str(e)) from e
+
+    if response.get("results"):
+        result = response["results"][0]
+        location = result["geometry"]["location"]
+        formatted_address = result.get("formatted_address", address)
+        return location["lat"], location["lng"], formatted_address
+
+    if response.get("status") not in (None, "OK", "ZERO_RESULTS"):
+        # OVER_QUERY_LIMIT, REQUEST_DENIED, ... say nothing about the address itself
+        raise GeocodeUnavailable(response.get("error_message") or response["status"])
 
     return None, None, None
+
+
+def _store_geocode(key, address, lat, lng, formatted_address):
+    found = lat is not None and lng is not None
+    ttl = GEOCODE_CACHE_TTL if found else GEOCODE_NEGATIVE_CACHE_TTL
+    values = {
+        "address": address,
+        "latitude": lat,
+        "longitude": lng,
+        "formatted_address": (formatted_address or "")[:255],
+        "found": found,
+        "expires_at": timezone.now() + ttl,
+    }
+
+    updated = GeocodeCache.objects.filter(address_key=key).update(misses=F("misses") + 1, **values)
+    if not updated:
+        try:
+            GeocodeCache.objects.create(address_key=key, misses=1, **values)
+        except IntegrityError:
+            # Another request stored the same address first
+            GeocodeCache.objects.filter(address_key=key).update(misses=F("misses") + 1, **values)
+
+
+def geocode_address(address, raise_unavailable=False):
+    """
+    (lat, lng, formatted_address) for an address, or (None, None, None) if there is no
+    match. Service errors also give (None, None, None) unless raise_unavailable is set,
+    in which case GeocodeUnavailable propagates so callers can tell them from a miss.
+    """
+    if not address:
+        return None, None, None
+
+    normalized = normalize_address(address)
+    key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    entry = GeocodeCache.objects.filter(address_key=key, expires_at__gt=timezone.now()).first()
+    if entry is not None:
+        GeocodeCache.objects.filter(pk=entry.pk).update(hits=F("hits") + 1)
+        if not entry.found:
+            return None, None, None
+        return entry.latitude, entry.longitude, entry.formatted_address or address
+
+    try:
+        lat, lng, formatted_address = _geocode_remote(address)
+    except GeocodeUnavailable as e:
+        # Transient failures are not cached so the next lookup can try again
+        if raise_unavailable:
+            raise
+        print("Geocoding error:", e)
+        return None, None, None
+
+    _store_geocode(key, normalized, lat, lng, formatted_address)
+    return lat, lng, formatted_address
+
+
+def claim_pending_geocodes(batch_size):
+    """
+    Lease up to batch_size due events to this worker by stamping geocode_claimed_at, in
+    a short transaction. Rows claimed by another worker within GEOCODE_CLAIM_LEASE are
+    skipped; an older claim is treated as abandoned.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            Event.objects.select_for_update(skip_locked=True)
+            .filter(geocode_status=Event.GEOCODE_PENDING)
+            .filter(Q(geocode_attempts=0) | Q(updated_at__lte=now - GEOCODE_RETRY_DELAY))
+            .filter(Q(geocode_claimed_at__isnull=True) | Q(geocode_claimed_at__lte=now - GEOCODE_CLAIM_LEASE))
+            .order_by("id")
+            .only("id", "location", "city", "geocode_attempts")[:batch_size]
+        )
+        Event.objects.filter(pk__in=[e.pk for e in events]).update(geocode_claimed_at=now)
+    for event in events:
+        event.geocode_claimed_at = now
+    return events
+
+
+def geocode_pending_events(batch_size=20, max_attempts=GEOCODE_MAX_ATTEMPTS):
+    """
+    Resolve coordinates for one batch of events queued with Event.request_geocode().
+    Rows are claimed up front, geocoded outside any transaction so no database lock is
+    held during the network calls, and each result is written on its own. A result is
+    dropped if the event was edited meanwhile (request_geocode clears the claim).
+    If the geocoding service is unavailable the batch stops there and the rest of it is
+    handed back without using up any attempts.
+    Returns (resolved, failed, retrying, unavailable) counts; all zero means the queue is empty.
+    """
+    resolved = failed = retrying = unavailable = 0
+
+    events = claim_pending_geocodes(batch_size)
+    for index, event in enumerate(events):
+        try:
+            lat, lng, _ = geocode_address(event.full_address, raise_unavailable=True)
+        except GeocodeUnavailable as e:
+            # An outage says nothing about the addresses, so release the claims untouched
+            print("Geocoding error:", e)
+            unreached = events[index:]
+            Event.objects.filter(
+                pk__in=[pending.pk for pending in unreached],
+                geocode_status=Event.GEOCODE_PENDING,
+                geocode_claimed_at=event.geocode_claimed_at,
+            ).update(geocode_claimed_at=None)
+            unavailable = len(unreached)
+            break
+
+        now = timezone.now()
+        values = {"geocode_claimed_at": None, "updated_at": now}
+        if lat is not None and lng is not None:
+            values.update(
+                latitude=lat,
+                longitude=lng,
+                geohash=geohash_encode(lat, lng),
+                geocode_status=Event.GEOCODE_DONE,
+            )
+            outcome = "resolved"
+        else:
+            values["geocode_attempts"] = event.geocode_attempts + 1
+            if values["geocode_attempts"] >= max_attempts:
+                values["geocode_status"] = Event.GEOCODE_FAILED
+                outcome = "failed"
+            else:
+                outcome = "retrying"
+
+        # One short UPDATE per result, and only if our claim still stands
+        written = Event.objects.filter(
+            pk=event.pk, geocode_status=Event.GEOCODE_PENDING, geocode_claimed_at=event.geocode_claimed_at,
+        ).update(**values)
+        if not written:
+            continue
+        if outcome == "resolved":
+            resolved += 1
+        elif outcome == "failed":
+            failed += 1
+        else:
+            retrying += 1
+
+    return resolved, failed, retrying, unavailable
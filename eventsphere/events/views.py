@@ -1,32 +1,35 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-import csv
-from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
-from django.shortcuts import render, redirect, get_object_or_404
 import json
+from datetime import datetime
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.conf import settings
 from accounts.models import UserProfile
 from .models import EventOrganizer, Event, RSVP
 from .forms import EventOrganizerForm, EventForm, EventFilterForm
 from .utils import geocode_address
+from .geo import distances_from, nearest_indices
+from .analytics import ANALYTICS_DAYS, organizer_analytics
+from .cache import get_attendee_count
+from .emails import reminder_email
+from .exports import attendee_csv_rows, gzip_chunks
+from .waitlist import place_rsvp, promote_waitlist, waitlist_position
+from .travel import (
+    DEFAULT_POLYLINE_ZOOM, DETAIL_FULL, DETAIL_LEVELS, compute_travel_options, compute_travel_options_many,
+    iter_travel_options, straight_line_estimate, trim_option, trim_travel_options,
+)
 from django.views.decorators.http import require_POST
-from django.core.mail import send_mail
+from django.db.models import Avg, Count, OuterRef, Q, Subquery
+from django.db.models.functions import Substr
+from django.db import transaction
+from django.core.paginator import Paginator
+from notifications.digests import record_rsvp_activity, wants_digest
+from notifications.fanout import start_fanout
+from notifications.models import FanoutJob, RSVPActivity
+from notifications.utils import enqueue_email
 from accounts.models import UserProfile
-import math
-import requests
-import re
-
-def haversine(lat1, lon1, lat2, lon2):
-    """Return distance in km between two lat/lng points."""
-    R = 6371  # Earth radius in km
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-    a = math.sin(delta_phi / 2) ** 2 + \
-        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
 
 # Create your views here.
 @login_required
@@ -61,12 +64,8 @@ def create_event(request):
         if form.is_valid():
             event = form.save(commit=False)
             event.organizer = request.user
-
-            # Combine location and city for better geocoding
-            full_address = f"{event.location}, {event.city}" if event.city else event.location
-            lat, lng, _ = geocode_address(full_address)
-            event.latitude = lat
-            event.longitude = lng
+            # Coordinates are filled in by the geocode_worker command
+            event.request_geocode()
 
             event.save()
             messages.success(request, f"'{event.title}' created successfully!")
@@ -82,9 +81,38 @@ def create_event(request):
 @login_required
 def my_events(request):
     # show only events created by the logged-in organizer
-    events = Event.objects.filter(organizer=request.user)
+    # Latest reminder/update fan-out per event, for the progress badge
+    latest_job = (
+        FanoutJob.objects.filter(event=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .values("id")[:1]
+    )
+    events = list(
+        Event.objects.filter(organizer=request.user).annotate(latest_fanout_id=Subquery(latest_job))
+    )
+
+    # Only the fields the badge shows; job bodies can be large
+    latest_jobs = FanoutJob.objects.only(
+        "event_id", "kind", "status", "total", "sent", "deferred", "finished_at"
+    ).in_bulk([event.latest_fanout_id for event in events if event.latest_fanout_id])
+    for event in events:
+        event.latest_fanout = latest_jobs.get(event.latest_fanout_id)
+
     return render(request, 'events/my_events.html', {'events': events})
 
+@login_required
+def organizer_analytics_view(request):
+    """RSVP status counts and a per-day trend for each of the organizer's events."""
+    try:
+        days = min(max(int(request.GET.get("days", ANALYTICS_DAYS)), 1), 90)
+    except ValueError:
+        days = ANALYTICS_DAYS
+    analytics = organizer_analytics(request.user, days)
+    return render(request, 'events/organizer_analytics.html', {
+        'analytics': analytics,
+        'status_choices': RSVP.STATUS_CHOICES,
+    })
+
 @login_required
 def delete_event(request, event_id):
     event = get_object_or_404(Event, id=event_id, organizer=request.user)
@@ -106,74 +134,57 @@ def edit_event(request, event_id):
         form = EventForm(request.POST, request.FILES, instance=event)
 
         if form.is_valid():
-            original_event = Event.objects.get(pk=event.pk)
-
-            updated_event = form.save(commit=False)
-
-            if 'location' in form.changed_data or 'city' in form.changed_data:
-                full_address = f"{updated_event.location}, {updated_event.city}" if updated_event.city else updated_event.location
-                lat, lng, _ = geocode_address(full_address)
-                updated_event.latitude = lat
-                updated_event.longitude = lng
-
-            updated_event.save()
-
-            notify = bool(request.POST.get("notify_attendees"))
-
-            if notify:
-                field_labels = {
-                    "title": "Title",
-                    "description": "Description",
-                    "location": "Location",
-                    "city": "City",
-                    "date": "Date",
-                    "time": "Time",
-                    "price": "Price",
-                    "ticket_url": "Ticket link",
-                    "capacity": "Capacity",
-                    "image": "Image",
-                    "category": "Category",
-                }
-
-                change_lines = []
-                for name in form.changed_data:
-                    if name in ["latitude", "longitude"]:
-                        continue
-
-                    old_val = getattr(original_event, name, None)
-                    new_val = getattr(updated_event, name, None)
-
-                    if name == "category":
-                        old_val = dict(Event.CATEGORY_CHOICES).get(old_val, old_val)
-                        new_val = dict(Event.CATEGORY_CHOICES).get(new_val, new_val)
-
-                    label = field_labels.get(name, name.replace("_", " ").title())
-                    change_lines.append(f"- {label}: {old_val} → {new_val}")
-
-                if not change_lines:
-                    change_text = "Details of the changes are not available."
-                else:
-                    change_text = "\n".join(change_lines)
-
-                rsvps = RSVP.objects.filter(
-                    event=updated_event,
-                    status__in=[RSVP.GOING, RSVP.INTERESTED],
-                ).select_related("attendee")
-
-                recipient_list = []
-                for r in rsvps:
-                    email = (r.contact_email or getattr(r.attendee, "email", "") or "").strip()
-                    if email:
-                        recipient_list.append(email)
-                        
-                recipient_list = sorted(set(recipient_list))
-
-                if recipient_list:
-                    organizer_email = updated_event.organizer.email
-                    if organizer_email:
-                        recipient_list.append(organizer_email)
-
-                    recipient_list = sorted(set(recipient_list))
+            # Only the POST branch writes, so a GET never takes the write lock
+            with transaction.atomic():
+                updated_event = form.save(commit=False)
+                # is_valid() already copied the new values onto the instance; the old
+                # ones come from its load-time snapshot, which save() then moves forward
+                previous = {name: updated_event.previous_value(name) for name in form.changed_data}
+
+                if 'location' in form.changed_data or 'city' in form.changed_data:
+                    updated_event.request_geocode()
+
+                updated_event.save()
+                if 'capacity' in form.changed_data:
+                    # A raised (or removed) limit lets people in off the waitlist
+                    promote_waitlist(updated_event)
+
+                notify = bool(request.POST.get("notify_attendees"))
+
+                if notify:
+                    field_labels = {
+                        "title": "Title",
+                        "description": "Description",
+                        "location": "Location",
+                        "city": "City",
+                        "date": "Date",
+                        "time": "Time",
+                        "price": "Price",
+                        "ticket_url": "Ticket link",
+                        "capacity": "Capacity",
+                        "image": "Image",
+                        "category": "Category",
+                    }
+
+                    change_lines = []
+                    for name in form.changed_data:
+                        if name in ["latitude", "longitude"]:
+                            continue
+
+                        old_val = previous[name]
+                        new_val = getattr(updated_event, name, None)
+
+                        if name == "category":
+                            old_val = dict(Event.CATEGORY_CHOICES).get(old_val, old_val)
+                            new_val = dict(Event.CATEGORY_CHOICES).get(new_val, new_val)
+
+                        label = field_labels.get(name, name.replace("_", " ").title())
+                        change_lines.append(f"- {label}: {old_val} → {new_val}")
+
+                    if not change_lines:
+                        change_text = "Details of the changes are not available."
+                    else:
+                        change_text = "\n".join(change_lines)
 
                     subject = f"Update to event '{updated_event.title}'"
                     message = (
@@ -187,17 +198,11 @@ def edit_event(request, event_id):
                         f"— EventSphere Team"
                     )
 
-                    print("[DEBUG] Sending update email to:", recipient_list)
-
-                    try:
-                        send_mail(
-                            subject,
-                            message,
-                            settings.DEFAULT_FROM_EMAIL,
-                            recipient_list,
-                        )
-                    except Exception as e:
-                        print(f"[Email Error] Could not send event update notifications: {e}")
+                    # Sent per attendee by the send_outbox worker; waitlisted attendees need to hear about changes too
+                    start_fanout(
+                        updated_event, FanoutJob.KIND_UPDATE, subject, message,
+                        statuses=(RSVP.GOING, RSVP.INTERESTED, RSVP.WAITLISTED),
+                    )
 
             messages.success(request, f"'{updated_event.title}' updated successfully!")
             return redirect('my_events')
@@ -210,10 +215,19 @@ def edit_event(request, event_id):
     return render(request, 'events/edit_event.html', {'form': form, 'event': event})
 
 
-def events_map(request):
-    filter_form = EventFilterForm(request.GET or None)
+# Zoom levels below this get geohash clusters instead of individual markers
+MAP_CLUSTER_MAX_ZOOM = getattr(settings, "MAP_CLUSTER_MAX_ZOOM", 11)
+MAP_MAX_MARKERS = getattr(settings, "MAP_MAX_MARKERS", 500)
+TRAVEL_OPTIONS_BATCH_LIMIT = getattr(settings, "TRAVEL_OPTIONS_BATCH_LIMIT", 25)
+# Events listed under the map per page; markers come from events_map_markers
+MAP_LIST_PAGE_SIZE = getattr(settings, "MAP_LIST_PAGE_SIZE", 20)
+
+
+def _map_events_queryset(filter_form):
+    """Approved upcoming events narrowed by the EventFilterForm fields."""
     qs = Event.objects.filter(
         approval_status=Event.STATUS_APPROVED,
+        geocode_status=Event.GEOCODE_DONE,
         date__gte=timezone.localdate()
     ).order_by('date')
 
@@ -229,62 +243,233 @@ def events_map(request):
         if end_date:
             qs = qs.filter(date__lte=end_date)
 
-    valid_events = [event for event in qs if event.latitude and event.longitude]
+    return qs
+
+
+def _event_row(event):
+    """Map data for one event; _event_marker turns it into marker JSON."""
+    return {
+        "id": event.id,
+        "title": event.title,
+        "description": event.description,
+        "date": event.date,
+        "time": event.time,
+        "location": event.location,
+        "category": event.category,
+        "ticket_url": event.ticket_url,
+        "latitude": float(event.latitude),
+        "longitude": float(event.longitude),
+        "calendar_url": event.google_calendar_url(),
+        "image_url": event.image.url if event.image else None,
+    }
+
+
+def _event_marker(request, row):
+    """JSON-ready marker data for one map row."""
+    return {
+        "title": row["title"],
+        "description": row["description"],
+        "date": row["date"].strftime("%Y-%m-%d"),
+        "time": row["time"].strftime("%H:%M") if row["time"] else None,
+        "location_name": row["location"],
+        "latitude": row["latitude"],
+        "longitude": row["longitude"],
+        "calendar_url": row["calendar_url"],
+        "image_url": request.build_absolute_uri(row["image_url"]) if row["image_url"] else None,
+        'id': row["id"],
+        "category": row["category"],
+    }
 
-    # Optional: filter by user location if lat/lng GET params exist
-    user_lat = request.GET.get('lat')
-    user_lng = request.GET.get('lng')
-    max_distance_km = float(request.GET.get('radius') or 50)  # default 50 km
 
+def _map_search_origin(request):
+    """(lat, lng, radius_km) of the radius search in the query string; lat/lng are None without one."""
     try:
-        user_lat = float(user_lat) if user_lat else None
-        user_lng = float(user_lng) if user_lng else None
+        max_distance_km = float(request.GET.get('radius') or 50)  # default 50 km
     except ValueError:
-        user_lat = None
-        user_lng = None
+        max_distance_km = 50.0
+    try:
+        user_lat = float(request.GET['lat']) if request.GET.get('lat') else None
+        user_lng = float(request.GET['lng']) if request.GET.get('lng') else None
+    except ValueError:
+        return None, None, max_distance_km
+    return user_lat, user_lng, max_distance_km
+
+
+def _cluster_precision(zoom):
+    """Geohash prefix length used to group markers at a given map zoom."""
+    if zoom <= 2:
+        return 1
+    if zoom <= 4:
+        return 2
+    if zoom <= 7:
+        return 3
+    if zoom <= 9:
+        return 4
+    return 5
+
+
+def events_map(request):
+    filter_form = EventFilterForm(request.GET or None)
+
+    sort_by_distance = (
+        filter_form.is_valid()
+        and filter_form.cleaned_data.get('sort') == EventFilterForm.SORT_DISTANCE
+    )
+
+    # Optional: filter by user location if lat/lng GET params exist
+    user_lat, user_lng, max_distance_km = _map_search_origin(request)
 
     if user_lat is not None and user_lng is not None:
-        valid_events = [
-            event for event in valid_events
-            if haversine(user_lat, user_lng, float(event.latitude), float(event.longitude)) <= max_distance_km
-        ]
+        # Only pull coordinates from nearby geohash cells; exact distance is checked below
+        candidates = list(
+            _map_events_queryset(filter_form)
+            .near(user_lat, user_lng, max_distance_km)
+            .filter(latitude__isnull=False, longitude__isnull=False)
+            .values_list("id", "latitude", "longitude")
+        )
+
+        distances = distances_from(
+            user_lat, user_lng,
+            [float(lat) for _, lat, _ in candidates],
+            [float(lng) for _, _, lng in candidates],
+        )
+        nearby = nearest_indices(distances, radius_km=max_distance_km, sort=sort_by_distance)
+        page = Paginator(
+            [(candidates[i][0], float(distances[i])) for i in nearby], MAP_LIST_PAGE_SIZE
+        ).get_page(request.GET.get("page"))
+
+        # Full rows are only built for the events on this page
+        page_events = Event.objects.in_bulk([event_id for event_id, _ in page])
+        valid_events = []
+        for event_id, distance_km in page:
+            row = _event_row(page_events[event_id])
+            row["distance_km"] = distance_km
+            valid_events.append(row)
+    else:
+        page = Paginator(
+            _map_events_queryset(filter_form).filter(latitude__isnull=False, longitude__isnull=False),
+            MAP_LIST_PAGE_SIZE,
+        ).get_page(request.GET.get("page"))
+        valid_events = [_event_row(event) for event in page]
 
     user_rsvp_by_event = {}
     if request.user.is_authenticated:
-        event_ids = [e.id for e in valid_events]
+        event_ids = [e["id"] for e in valid_events]
         user_rsvp_by_event = {
             r.event_id: r.status
             for r in RSVP.objects.filter(attendee=request.user, event_id__in=event_ids)
         }
 
-    events_json = json.dumps([
-        {
-            "title": event.title,
-            "description": event.description,
-            "date": event.date.strftime("%Y-%m-%d"),
-            "time": event.time.strftime("%H:%M") if event.time else None,
-            "location_name": event.location,
-            "latitude": float(event.latitude),
-            "longitude": float(event.longitude),
-            "calendar_url": event.google_calendar_url(),
-            "image_url": request.build_absolute_uri(event.image.url) if event.image else None,
-            'id': event.id,
-            "category": getattr(event, "category", None),
-        }
-        for event in valid_events
-    ])
+    base_query = request.GET.copy()
+    base_query.pop("page", None)
+    previous_query = next_query = None
+    if page.has_previous():
+        query = base_query.copy()
+        query["page"] = page.previous_page_number()
+        previous_query = query.urlencode()
+    if page.has_next():
+        query = base_query.copy()
+        query["page"] = page.next_page_number()
+        next_query = query.urlencode()
 
     context = {
         "events": valid_events,
-        "events_json": events_json,
+        "page": page,
+        "previous_query": previous_query,
+        "next_query": next_query,
         "google_maps_api_key": settings.GOOGLE_MAPS_API_KEY,
         "filter_form": filter_form,
         "user_rsvp_by_event": user_rsvp_by_event,
         "user_lat": user_lat,
         "user_lng": user_lng,
+        "travel_batch_limit": TRAVEL_OPTIONS_BATCH_LIMIT,
     }
     return render(request, "events/events_map.html", context)
 
+
+def events_map_markers(request):
+    """
+    Markers for the part of the map currently on screen.
+    Expects north/south/east/west bounds and the map zoom, plus the usual filter fields
+    and, for a radius search, lat/lng/radius as on the map page.
+    Below MAP_CLUSTER_MAX_ZOOM events are grouped by geohash cell into clusters.
+    """
+    try:
+        north = float(request.GET["north"])
+        south = float(request.GET["south"])
+        east = float(request.GET["east"])
+        west = float(request.GET["west"])
+        zoom = int(float(request.GET.get("zoom", MAP_CLUSTER_MAX_ZOOM)))
+    except (KeyError, ValueError):
+        return JsonResponse({
+            "success": False,
+            "error": "Map bounds are required"
+        }, status=400)
+
+    filter_form = EventFilterForm(request.GET)
+    south, north = min(south, north), max(south, north)
+    user_lat, user_lng, max_distance_km = _map_search_origin(request)
+
+    qs = _map_events_queryset(filter_form).filter(
+        latitude__isnull=False,
+        longitude__isnull=False,
+        latitude__range=(south, north),
+    )
+    if west <= east:
+        qs = qs.filter(longitude__range=(west, east))
+    else:
+        # The viewport wraps around the antimeridian
+        qs = qs.filter(Q(longitude__gte=west) | Q(longitude__lte=east))
+    if user_lat is not None and user_lng is not None:
+        qs = qs.near(user_lat, user_lng, max_distance_km)
+
+    if zoom < MAP_CLUSTER_MAX_ZOOM:
+        # Clusters use the geohash prefilter alone; they are approximate anyway
+        precision = _cluster_precision(zoom)
+        cells = (
+            qs.order_by()
+            .annotate(cell=Substr("geohash", 1, precision))
+            .values("cell")
+            .annotate(count=Count("id"), latitude=Avg("latitude"), longitude=Avg("longitude"))
+        )
+        clusters = [
+            {
+                "geohash": cell["cell"],
+                "count": cell["count"],
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+            }
+            for cell in cells
+        ]
+        return JsonResponse({
+            "success": True,
+            "zoom": zoom,
+            "clustered": True,
+            "clusters": clusters,
+            "total": sum(cluster["count"] for cluster in clusters),
+        })
+
+    if user_lat is not None and user_lng is not None:
+        candidates = list(qs.values_list("id", "latitude", "longitude"))
+        distances = distances_from(
+            user_lat, user_lng,
+            [float(lat) for _, lat, _ in candidates],
+            [float(lng) for _, _, lng in candidates],
+        )
+        event_ids = [candidates[i][0] for i in nearest_indices(distances, radius_km=max_distance_km)]
+        events = Event.objects.in_bulk(event_ids[:MAP_MAX_MARKERS + 1])
+        events = [events[event_id] for event_id in event_ids[:MAP_MAX_MARKERS + 1]]
+    else:
+        events = list(qs[:MAP_MAX_MARKERS + 1])
+
+    return JsonResponse({
+        "success": True,
+        "zoom": zoom,
+        "clustered": False,
+        "events": [_event_marker(request, _event_row(event)) for event in events[:MAP_MAX_MARKERS]],
+        "truncated": len(events) > MAP_MAX_MARKERS,
+    })
+
 def event_detail(request, event_id):
     event = get_object_or_404(Event, id=event_id)
     return render(request, 'events/event_detail.html', {'event': event})
@@ -302,90 +487,130 @@ def event_send_reminder(request, event_id):
     if not (request.user.is_staff or request.user.is_superuser or event.organizer_id == request.user.id):
         return HttpResponseForbidden("Access denied. Organizer only.")
 
-    rsvps = RSVP.objects.filter(
-        event=event,
-        status__in=[RSVP.GOING, RSVP.INTERESTED],
-    ).select_related("attendee")
+    subject, message = reminder_email(event)
 
-    recipient_list = []
-    for r in rsvps:
-        email = (r.contact_email or getattr(r.attendee, "email", "") or "").strip()
-        if email:
-            recipient_list.append(email)
+    # Sent per attendee by the send_outbox worker, so big events don't hold up this request
+    job = start_fanout(event, FanoutJob.KIND_REMINDER, subject, message)
+    if job is None:
+        messages.warning(request, "No attendees to remind.")
+        return redirect("my_events")
 
-    organizer_email = event.organizer.email
-    if organizer_email:
-        recipient_list.append(organizer_email)
+    messages.success(request, f"Reminder is being sent to {job.total} attendee(s).")
+    return redirect("my_events")
 
-    recipient_list = sorted(set(recipient_list))
+ATTENDEES_PAGE_SIZE = getattr(settings, "ATTENDEES_PAGE_SIZE", 50)
 
-    if not recipient_list:
-        messages.warning(request, "No attendees with valid email addresses to remind.")
-        return redirect("my_events")
 
-    subject = f"Reminder: '{event.title}' is coming up"
-    message = (
-        f"Hello,\n\n"
-        f"This is a reminder for the event '{event.title}' that you RSVP'd to.\n\n"
-        f"Event details:\n"
-        f"- Date: {event.date}\n"
-        f"- Time: {event.time or 'TBA'}\n"
-        f"- Location: {event.location}, {event.city or ''}\n\n"
-        f"If you can no longer attend, you can update your RSVP in EventSphere.\n\n"
-        f"— EventSphere Team"
-    )
+def _attendee_cursor(rsvp):
+    return f"{rsvp.created_at.isoformat()}_{rsvp.id}"
 
-    print("[DEBUG] Sending reminder email to:", recipient_list)
 
+def _parse_attendee_cursor(value):
+    """(created_at, id) from a cursor made by _attendee_cursor, or None if it is malformed."""
+    created_at, _, rsvp_id = (value or "").rpartition("_")
     try:
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipient_list)
-        messages.success(request, f"Reminder sent to {len(recipient_list)} recipient(s).")
-    except Exception as e:
-        print(f"[Email Error] Could not send reminder emails: {e}")
-        messages.error(request, "Could not send reminder emails. Check server logs for details.")
+        return datetime.fromisoformat(created_at), int(rsvp_id)
+    except ValueError:
+        return None
 
-    return redirect("my_events")
 
 @login_required
 def event_attendees(request, event_id):
-    """Shows a table of RSVPs for one event."""
+    """
+    Shows a table of RSVPs for one event, newest first, filterable by status and
+    searchable by username/email. Pages use keyset (seek) pagination on
+    (created_at, id), so any page costs the same as the first one.
+    """
     event, deny = _require_event_organizer_or_403(request, event_id)
     if deny:
         return deny
-    attendees = RSVP.objects.select_related("attendee").filter(event=event).order_by("-created_at")
-    return render(request, "events/event_attendees.html", {"event": event, "attendees": attendees})
+
+    status = request.GET.get("status", "")
+    if status not in RSVP.COUNT_FIELDS:
+        status = ""
+    search = request.GET.get("q", "").strip()
+
+    rsvps = RSVP.objects.filter(event=event)
+    if status:
+        rsvps = rsvps.filter(status=status)
+    if search:
+        rsvps = rsvps.filter(
+            Q(attendee__username__icontains=search)
+            | Q(attendee__email__icontains=search)
+            | Q(contact_email__icontains=search)
+        )
+
+    after = _parse_attendee_cursor(request.GET.get("after"))
+    before = _parse_attendee_cursor(request.GET.get("before"))
+    page = rsvps.select_related("attendee")
+    if before:
+        # Walk backwards from the first row of the current page, then flip
+        created_at, rsvp_id = before
+        page = page.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=rsvp_id))
+        page = list(page.order_by("created_at", "id")[:ATTENDEES_PAGE_SIZE + 1])
+        has_newer = len(page) > ATTENDEES_PAGE_SIZE
+        page = page[:ATTENDEES_PAGE_SIZE][::-1]
+        has_older = True
+    else:
+        if after:
+            created_at, rsvp_id = after
+            page = page.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=rsvp_id))
+        page = list(page.order_by("-created_at", "-id")[:ATTENDEES_PAGE_SIZE + 1])
+        has_older = len(page) > ATTENDEES_PAGE_SIZE
+        page = page[:ATTENDEES_PAGE_SIZE]
+        has_newer = after is not None
+
+    # Unfiltered per-status totals come from the Event counters; search results are counted once and cached
+    status_totals = [
+        (value, label, getattr(event, RSVP.COUNT_FIELDS[value])) for value, label in RSVP.STATUS_CHOICES
+    ]
+    if search:
+        total = get_attendee_count(event.id, status, search, rsvps.count)
+    elif status:
+        total = getattr(event, RSVP.COUNT_FIELDS[status])
+    else:
+        total = event.rsvp_total
+
+    base_query = request.GET.copy()
+    for key in ("after", "before"):
+        base_query.pop(key, None)
+    older_query = newer_query = None
+    if page and has_older:
+        query = base_query.copy()
+        query["after"] = _attendee_cursor(page[-1])
+        older_query = query.urlencode()
+    if page and has_newer:
+        query = base_query.copy()
+        query["before"] = _attendee_cursor(page[0])
+        newer_query = query.urlencode()
+
+    return render(request, "events/event_attendees.html", {
+        "event": event,
+        "attendees": page,
+        "status": status,
+        "search": search,
+        "status_totals": status_totals,
+        "total": total,
+        "older_query": older_query,
+        "newer_query": newer_query,
+        "is_first_page": not (after or before),
+    })
 
 @login_required
 def event_attendees_export_csv(request, event_id):
-    """Exports RSVPs as CSV."""
+    """Streams RSVPs as CSV; ?gzip=1 streams a gzip-compressed .csv.gz instead."""
     event, deny = _require_event_organizer_or_403(request, event_id)
     if deny:
         return deny
 
-    rows = (
-        RSVP.objects.select_related("attendee")
-        .filter(event=event)
-        .values_list(
-            "attendee__id",
-            "attendee__username",
-            "attendee__first_name",
-            "attendee__last_name",
-            "attendee__email",
-            "contact_email",
-            "status",
-            "created_at",
-        )
-    )
-
-    resp = HttpResponse(content_type="text/csv")
-    resp["Content-Disposition"] = f'attachment; filename="event_{event.id}_attendees.csv"'
-    writer = csv.writer(resp)
-    writer.writerow([
-        "Attendee ID", "Username", "First name", "Last name",
-        "User email", "RSVP contact email", "RSVP status", "RSVP created_at"
-    ])
-    for row in rows:
-        writer.writerow(row)
+    filename = f"event_{event.id}_attendees.csv"
+    rows = attendee_csv_rows(event)
+    if request.GET.get("gzip") in ("1", "true"):
+        resp = StreamingHttpResponse(gzip_chunks(rows), content_type="application/gzip")
+        filename += ".gz"
+    else:
+        resp = StreamingHttpResponse(rows, content_type="text/csv")
+    resp["Content-Disposition"] = f'attachment; filename="{filename}"'
     return resp
 
 @login_required
@@ -395,13 +620,29 @@ def rsvp_event(request, event_id):
     status = request.POST.get("status", RSVP.GOING)
     contact_email = request.POST.get("contact_email", request.user.email or "")
 
-    # Create or update RSVP
-    rsvp, created = RSVP.objects.update_or_create(
-        event=event,
-        attendee=request.user,
-        defaults={"status": status, "contact_email": contact_email},
-    )
+    if status not in (RSVP.GOING, RSVP.INTERESTED, RSVP.NOT_GOING):
+        status = RSVP.GOING
+
+    with transaction.atomic():
+        # Takes a seat, joins the waitlist or frees a seat as needed
+        rsvp, created, previous_status = place_rsvp(event, request.user, status, contact_email)
+        _queue_rsvp_emails(request, event, rsvp, created)
+
+    if rsvp.status == RSVP.WAITLISTED:
+        messages.info(
+            request,
+            f"'{event.title}' is full. You're number {waitlist_position(rsvp)} on the waitlist "
+            f"and will get an email if a spot opens up.",
+        )
+
+    return redirect("events_map")
+
 
+def _queue_rsvp_emails(request, event, rsvp, created):
+    """
+    Queue the attendee confirmation for an RSVP change, and either the organizer
+    notice or, for organizers on digests, an RSVPActivity row.
+    """
     organizer_email = event.organizer.email
     attendee_email = request.user.email
     attendee_name = request.user.get_full_name() or request.user.username
@@ -429,117 +670,110 @@ def rsvp_event(request, event_id):
         f"— EventSphere Team"
     )
 
-    try:
-        send_mail(subject_org, message_org, settings.DEFAULT_FROM_EMAIL, [organizer_email])
-        send_mail(subject_user, message_user, settings.DEFAULT_FROM_EMAIL, [attendee_email])
-    except Exception as e:
-        print(f"[Email Error] Could not send RSVP notification: {e}")
-
-    return redirect("events_map")
+    if wants_digest(event.organizer):
+        record_rsvp_activity(
+            event, attendee_name,
+            RSVPActivity.ACTION_CREATED if created else RSVPActivity.ACTION_UPDATED,
+            rsvp.status,
+        )
+    else:
+        enqueue_email(subject_org, message_org, [organizer_email])
+    enqueue_email(subject_user, message_user, [attendee_email])
 
 
-def parse_duration(duration_str):
-    """Parse duration string like '514s' into human-readable format."""
-    if not duration_str:
-        return "Unknown"
+def _travel_origin(request):
+    """
+    Read the origin from origin_lat/origin_lng, or geocode the origin address.
+    Returns (origin_lat, origin_lng, formatted_address, error_response).
+    """
+    origin_lat = request.GET.get("origin_lat")
+    origin_lng = request.GET.get("origin_lng")
     
-    match = re.match(r'(\d+)s?$', str(duration_str))
-    if match:
-        total_seconds = int(match.group(1))
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
+    origin_formatted_address = None
+    if not origin_lat or not origin_lng:
+        addr = request.GET.get("origin", "").strip()
+        if not addr:
+            return None, None, None, JsonResponse({
+                "success": False,
+                "error": "No origin provided"
+            }, status=400)
         
-        if hours > 0:
-            return f"{hours}h {minutes}min"
-        elif minutes > 0:
-            return f"{minutes} min"
-        else:
-            return f"{total_seconds} sec"
-    
-    return str(duration_str)
-
-
-def estimate_gas_cost(distance_meters):
-    """Estimate gas cost for driving."""
-    if distance_meters == 0:
-        return {"formatted": "Free", "amount": 0}
+        lat, lng, formatted_addr = geocode_address(addr)
+        if lat is None or lng is None:
+            return None, None, None, JsonResponse({
+                "success": False,
+                "error": f"Could not find location: {addr}"
+            }, status=400)
+        origin_lat, origin_lng = lat, lng
+        origin_formatted_address = formatted_addr
     
-    distance_miles = distance_meters / 1609.34
-    mpg = 25  # Average fuel efficiency
-    gas_price = 3.50  # Average gas price per gallon
-    cost = distance_miles / mpg * gas_price
+    try:
+        origin_lat = float(origin_lat)
+        origin_lng = float(origin_lng)
+    except (ValueError, TypeError):
+        return None, None, None, JsonResponse({
+            "success": False,
+            "error": "Invalid coordinates"
+        }, status=400)
     
-    return {
-        "formatted": f"${cost:.2f}",
-        "amount": round(cost, 2)
-    }
+    return origin_lat, origin_lng, origin_formatted_address, None
 
 
-def estimate_uber_cost(distance_meters):
-    """Estimate Uber cost based on distance."""
-    if distance_meters == 0:
-        return {"formatted": "N/A", "amount": 0}
-    
-    distance_miles = distance_meters / 1609.34
-    
-    # Uber pricing: base + per mile + booking fee + surge estimate
-    base_fare = 2.50
-    per_mile = 1.75
-    booking_fee = 2.75
+def _travel_detail(request):
+    """
+    Read the optional detail (see travel.DETAIL_LEVELS) and zoom parameters.
+    Returns (detail, zoom, error_response).
+    """
+    detail = request.GET.get("detail", DETAIL_FULL)
+    if detail not in DETAIL_LEVELS:
+        return None, None, JsonResponse({
+            "success": False,
+            "error": f"detail must be one of: {', '.join(DETAIL_LEVELS)}"
+        }, status=400)
     
-    total = base_fare + (distance_miles * per_mile) + booking_fee
+    try:
+        zoom = min(max(int(request.GET.get("zoom", DEFAULT_POLYLINE_ZOOM)), 0), 21)
+    except ValueError:
+        return None, None, JsonResponse({"success": False, "error": "Invalid zoom"}, status=400)
     
-    return {
-        "formatted": f"${total:.2f}",
-        "amount": round(total, 2),
-        "range": f"${total*.9:.2f} - ${total*1.3:.2f}"  # Show range for surge
-    }
+    return detail, zoom, None
 
 
-def estimate_lyft_cost(distance_meters):
-    """Estimate Lyft cost (similar to Uber)."""
-    if distance_meters == 0:
-        return {"formatted": "N/A", "amount": 0}
-    
-    distance_miles = distance_meters / 1609.34
+def _travel_response_data(event, origin_lat, origin_lng, travel_options_result, origin_formatted_address=None):
+    # Count available modes
+    available_modes = [k for k, v in travel_options_result.items() if v.get("available", False)]
     
-    # Lyft pricing (slightly different from Uber)
-    base_fare = 2.00
-    per_mile = 1.65
-    service_fee = 3.00
+    response_data = {
+        "success": True,
+        "event_id": event.id,
+        "event_title": event.title,
+        "event_location": event.location,
+        "event_coordinates": {
+            "latitude": float(event.latitude),
+            "longitude": float(event.longitude)
+        },
+        "origin_coordinates": {
+            "latitude": origin_lat,
+            "longitude": origin_lng
+        },
+        "travel_options": travel_options_result,
+        "available_modes": available_modes,
+        "total_modes": len(travel_options_result)
+    }
     
-    total = base_fare + (distance_miles * per_mile) + service_fee
+    # Include formatted address if available
+    if origin_formatted_address:
+        response_data["origin_formatted_address"] = origin_formatted_address
     
-    return {
-        "formatted": f"${total:.2f}",
-        "amount": round(total, 2),
-        "range": f"${total*.9:.2f} - ${total*1.3:.2f}"
-    }
-
-
-def estimate_transit_cost():
-    """Standard transit fare."""
-    return {
-        "formatted": "$2.75",
-        "amount": 2.75,
-        "note": "Single ride fare"
-    }
+    return response_data
 
 
-def get_parking_info(event_lat, event_lng):
-    """Get basic parking information near event location."""
-    # This is a placeholder - you could integrate with parking APIs
-    # For now, return generic info
-    return {
-        "available": True,
-        "estimated_cost": "$10-25",
-        "note": "Street and lot parking available nearby"
-    }
-
 def travel_options(request, event_id):
     """
     Calculate comprehensive travel options to an event.
     Returns: Drive, Walk, Transit, Bike, Uber, Lyft
+    Optional detail=full|simplified|compact|none trims the payload; simplified and
+    compact reduce route polylines for display at the given zoom (default 12).
     """
     event = get_object_or_404(Event, id=event_id)
     
@@ -550,38 +784,59 @@ def travel_options(request, event_id):
             "error": "Event location coordinates are not available"
         }, status=400)
     
-    # Get origin coordinates
-    origin_lat = request.GET.get("origin_lat")
-    origin_lng = request.GET.get("origin_lng")
+    origin_lat, origin_lng, origin_formatted_address, error = _travel_origin(request)
+    if error:
+        return error
     
-    origin_formatted_address = None
-    if not origin_lat or not origin_lng:
-        addr = request.GET.get("origin", "").strip()
-        if not addr:
-            return JsonResponse({
-                "success": False,
-                "error": "No origin provided"
-            }, status=400)
-        
-        lat, lng, formatted_addr = geocode_address(addr)
-        if lat is None or lng is None:
-            return JsonResponse({
-                "success": False,
-                "error": f"Could not find location: {addr}"
-            }, status=400)
-        origin_lat, origin_lng = lat, lng
-        origin_formatted_address = formatted_addr
+    detail, zoom, error = _travel_detail(request)
+    if error:
+        return error
     
-    try:
-        origin_lat = float(origin_lat)
-        origin_lng = float(origin_lng)
-    except (ValueError, TypeError):
+    # Check API key
+    api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', None)
+    if not api_key:
         return JsonResponse({
             "success": False,
-            "error": "Invalid coordinates"
+            "error": "API key not configured"
+        }, status=500)
+    
+    travel_options_result = compute_travel_options(event, origin_lat, origin_lng, api_key)
+    travel_options_result = trim_travel_options(travel_options_result, detail, zoom)
+    
+    return JsonResponse(_travel_response_data(
+        event, origin_lat, origin_lng, travel_options_result, origin_formatted_address
+    ))
+
+
+def _sse(event_name, data):
+    return f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+
+
+def travel_options_stream(request, event_id):
+    """
+    Server-sent events variant of travel_options. Events, in order:
+      start     - event/origin details, as in the travel_options response
+      estimate  - straight-line drive/Uber/Lyft estimates, sent immediately
+      mode      - {"mode", "option"} for each real mode as its route arrives
+      done      - the complete travel_options response
+    Validation errors are returned as JSON with a 4xx/5xx status before streaming starts.
+    """
+    event = get_object_or_404(Event, id=event_id)
+    
+    if event.latitude is None or event.longitude is None:
+        return JsonResponse({
+            "success": False,
+            "error": "Event location coordinates are not available"
         }, status=400)
     
-    # Check API key
+    origin_lat, origin_lng, origin_formatted_address, error = _travel_origin(request)
+    if error:
+        return error
+    
+    detail, zoom, error = _travel_detail(request)
+    if error:
+        return error
+    
     api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', None)
     if not api_key:
         return JsonResponse({
@@ -589,238 +844,96 @@ def travel_options(request, event_id):
             "error": "API key not configured"
         }, status=500)
     
-    # Google Routes API setup
-    url = "https://routes.googleapis.com/directions/v2:computeRoutes"
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": api_key,
-        "X-Goog-FieldMask": "routes.distanceMeters,routes.duration,routes.polyline.encodedPolyline"
-    }
+    def stream():
+        start = _travel_response_data(event, origin_lat, origin_lng, {}, origin_formatted_address)
+        del start["travel_options"], start["available_modes"], start["total_modes"]
+        yield _sse("start", start)
+        yield _sse("estimate", {"travel_options": straight_line_estimate(event, origin_lat, origin_lng)})
+        
+        travel_options_result = {}
+        for mode_key, option in iter_travel_options(event, origin_lat, origin_lng, api_key):
+            option = trim_option(option, detail, zoom)
+            travel_options_result[mode_key] = option
+            yield _sse("mode", {"mode": mode_key, "option": option})
+        
+        yield _sse("done", _travel_response_data(
+            event, origin_lat, origin_lng, travel_options_result, origin_formatted_address
+        ))
     
-    origin = {
-        "location": {
-            "latLng": {
-                "latitude": origin_lat,
-                "longitude": origin_lng
-            }
-        }
-    }
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # keep nginx from holding events back
+    return response
+
+
+@login_required
+def travel_options_batch(request):
+    """
+    Travel options from one origin to several events in a single round trip.
+    Takes event_ids=1,2,3 plus the same origin parameters as travel_options; the
+    origin is geocoded once and every event/mode lookup runs concurrently.
+    Returns {"results": {event_id: <travel_options response>}, "errors": {event_id: message}}.
+    """
+    try:
+        event_ids = [int(i) for i in request.GET.get("event_ids", "").split(",") if i.strip()]
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid event_ids"}, status=400)
     
-    destination = {
-        "location": {
-            "latLng": {
-                "latitude": float(event.latitude),
-                "longitude": float(event.longitude)
-            }
-        }
-    }
+    event_ids = list(dict.fromkeys(event_ids))
+    if not event_ids:
+        return JsonResponse({"success": False, "error": "No events provided"}, status=400)
+    if len(event_ids) > TRAVEL_OPTIONS_BATCH_LIMIT:
+        return JsonResponse({
+            "success": False,
+            "error": f"At most {TRAVEL_OPTIONS_BATCH_LIMIT} events per request"
+        }, status=400)
     
-    # Define travel modes for Google API
-    GOOGLE_MODES = {
-        "drive": "DRIVE",
-        "walk": "WALK",
-        "transit": "TRANSIT",
-        "bicycle": "BICYCLE"
-    }
+    origin_lat, origin_lng, origin_formatted_address, error = _travel_origin(request)
+    if error:
+        return error
     
-    travel_options_result = {}
+    detail, zoom, error = _travel_detail(request)
+    if error:
+        return error
     
-    # Query each Google travel mode
-    for mode_key, mode_value in GOOGLE_MODES.items():
-        body = {
-            "origin": origin,
-            "destination": destination,
-            "travelMode": mode_value
-        }
-        
-        if mode_value == "DRIVE":
-            body["routingPreference"] = "TRAFFIC_AWARE_OPTIMAL"
-        
-        try:
-            response = requests.post(url, headers=headers, json=body, timeout=10)
-            
-            if response.status_code != 200:
-                error_data = response.json() if response.content else {}
-                error_msg = error_data.get("error", {}).get("message", f"HTTP {response.status_code}")
-                travel_options_result[mode_key] = {
-                    "available": False,
-                    "error": error_msg
-                }
-                continue
-            
-            data = response.json()
-            
-            if "routes" not in data or not data["routes"]:
-                travel_options_result[mode_key] = {
-                    "available": False,
-                    "error": "No route found"
-                }
-                continue
-            
-            route = data["routes"][0]
-            distance_m = route.get("distanceMeters", 0)
-            duration_str = route.get("duration", "")
-            polyline = route.get("polyline", {}).get("encodedPolyline", "")
-            
-            if distance_m > 0:
-                distance_km = distance_m / 1000
-                distance_mi = distance_m / 1609.34
-                distance_display = f"{distance_km:.1f} km ({distance_mi:.1f} mi)"
-            else:
-                distance_display = "Very close"
-            
-            duration_display = parse_duration(duration_str)
-            
-            # Add mode-specific details
-            if mode_key == "drive":
-                gas_cost = estimate_gas_cost(distance_m)
-                parking_info = get_parking_info(event.latitude, event.longitude)
-                
-                travel_options_result[mode_key] = {
-                    "available": True,
-                    "distance": distance_display,
-                    "distance_meters": distance_m,
-                    "distance_miles": distance_mi,
-                    "duration": duration_display,
-                    "duration_seconds": int(duration_str.replace('s', '')) if duration_str else 0,
-                    "gas_cost": gas_cost,
-                    "parking": parking_info,
-                    "polyline": polyline,
-                    "mode": mode_value,
-                    "mode_display": "Drive",
-                    "icon": "🚗",
-                    "deep_link": f"https://www.google.com/maps/dir/?api=1&origin={origin_lat},{origin_lng}&destination={event.latitude},{event.longitude}&travelmode=driving"
-                }
-            elif mode_key == "walk":
-                travel_options_result[mode_key] = {
-                    "available": True,
-                    "distance": distance_display,
-                    "distance_meters": distance_m,
-                    "distance_miles": distance_mi,
-                    "duration": duration_display,
-                    "duration_seconds": int(duration_str.replace('s', '')) if duration_str else 0,
-                    "cost": {"formatted": "Free", "amount": 0},
-                    "polyline": polyline,
-                    "mode": mode_value,
-                    "mode_display": "Walk",
-                    "icon": "🚶",
-                    "deep_link": f"https://www.google.com/maps/dir/?api=1&origin={origin_lat},{origin_lng}&destination={event.latitude},{event.longitude}&travelmode=walking"
-                }
-            elif mode_key == "transit":
-                transit_cost = estimate_transit_cost()
-                travel_options_result[mode_key] = {
-                    "available": True,
-                    "distance": distance_display,
-                    "distance_meters": distance_m,
-                    "distance_miles": distance_mi,
-                    "duration": duration_display,
-                    "duration_seconds": int(duration_str.replace('s', '')) if duration_str else 0,
-                    "cost": transit_cost,
-                    "polyline": polyline,
-                    "mode": mode_value,
-                    "mode_display": "Public Transit",
-                    "icon": "🚌",
-                    "deep_link": f"https://www.google.com/maps/dir/?api=1&origin={origin_lat},{origin_lng}&destination={event.latitude},{event.longitude}&travelmode=transit"
-                }
-            elif mode_key == "bicycle":
-                travel_options_result[mode_key] = {
-                    "available": True,
-                    "distance": distance_display,
-                    "distance_meters": distance_m,
-                    "distance_miles": distance_mi,
-                    "duration": duration_display,
-                    "duration_seconds": int(duration_str.replace('s', '')) if duration_str else 0,
-                    "cost": {"formatted": "Free", "amount": 0},
-                    "polyline": polyline,
-                    "mode": mode_value,
-                    "mode_display": "Bike",
-                    "icon": "🚴",
-                    "deep_link": f"https://www.google.com/maps/dir/?api=1&origin={origin_lat},{origin_lng}&destination={event.latitude},{event.longitude}&travelmode=bicycling"
-                }
-                
-        except requests.exceptions.Timeout:
-            travel_options_result[mode_key] = {
-                "available": False,
-                "error": "Request timed out"
-            }
-        except requests.exceptions.RequestException as e:
-            travel_options_result[mode_key] = {
-                "available": False,
-                "error": f"Connection error: {str(e)}"
-            }
-        except Exception as e:
-            travel_options_result[mode_key] = {
-                "available": False,
-                "error": f"Error: {str(e)}"
-            }
+    api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', None)
+    if not api_key:
+        return JsonResponse({
+            "success": False,
+            "error": "API key not configured"
+        }, status=500)
     
-    # Add ride-hailing estimates (based on driving route)
-    if 'drive' in travel_options_result and travel_options_result['drive'].get('available'):
-        drive_distance = travel_options_result['drive'].get('distance_meters', 0)
-        drive_duration = travel_options_result['drive'].get('duration', 'Unknown')
-        
-        # Uber - use web link that works on all devices
-        uber_cost = estimate_uber_cost(drive_distance)
-        travel_options_result['uber'] = {
-            "available": True,
-            "distance": travel_options_result['drive']['distance'],
-            "distance_meters": drive_distance,
-            "distance_miles": travel_options_result['drive'].get('distance_miles', 0),
-            "duration": drive_duration,
-            "cost": uber_cost,
-            "mode": "UBER",
-            "mode_display": "Uber",
-            "icon": "🚕",
-            "deep_link": f"https://m.uber.com/ul/?action=setPickup&pickup[latitude]={origin_lat}&pickup[longitude]={origin_lng}&dropoff[latitude]={event.latitude}&dropoff[longitude]={event.longitude}"
-        }
-        
-        # Lyft - use web link that works on all devices
-        lyft_cost = estimate_lyft_cost(drive_distance)
-        travel_options_result['lyft'] = {
-            "available": True,
-            "distance": travel_options_result['drive']['distance'],
-            "distance_meters": drive_distance,
-            "distance_miles": travel_options_result['drive'].get('distance_miles', 0),
-            "duration": drive_duration,
-            "cost": lyft_cost,
-            "mode": "LYFT",
-            "mode_display": "Lyft",
-            "icon": "🚖",
-            "deep_link": f"https://lyft.com/ride?id=lyft&pickup[latitude]={origin_lat}&pickup[longitude]={origin_lng}&destination[latitude]={event.latitude}&destination[longitude]={event.longitude}"
-        }
-    else:
-        travel_options_result['uber'] = {
-            "available": False,
-            "error": "Driving route not available"
-        }
-        travel_options_result['lyft'] = {
-            "available": False,
-            "error": "Driving route not available"
-        }
+    events = Event.objects.in_bulk(event_ids)
+    errors = {}
+    routable = []
+    for event_id in event_ids:
+        event = events.get(event_id)
+        if event is None:
+            errors[event_id] = "Event not found"
+        elif event.latitude is None or event.longitude is None:
+            errors[event_id] = "Event location coordinates are not available"
+        else:
+            routable.append(event)
     
-    # Count available modes
-    available_modes = [k for k, v in travel_options_result.items() if v.get("available", False)]
+    results = compute_travel_options_many(routable, origin_lat, origin_lng, api_key)
     
     response_data = {
         "success": True,
-        "event_id": event_id,
-        "event_title": event.title,
-        "event_location": event.location,
-        "event_coordinates": {
-            "latitude": float(event.latitude),
-            "longitude": float(event.longitude)
-        },
         "origin_coordinates": {
             "latitude": origin_lat,
             "longitude": origin_lng
         },
-        "travel_options": travel_options_result,
-        "available_modes": available_modes,
-        "total_modes": len(travel_options_result)
+        "results": {
+            event.id: _travel_response_data(
+                event, origin_lat, origin_lng,
+                trim_travel_options(results[event.id], detail, zoom),
+                origin_formatted_address,
+            )
+            for event in routable
+        },
+        "errors": errors,
     }
-    
-    # Include formatted address if available
     if origin_formatted_address:
         response_data["origin_formatted_address"] = origin_formatted_address
     
-    return JsonResponse(response_data)
\ No newline at end of file
+    return JsonResponse(response_data)
@@ -0,0 +1,121 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from notifications.utils import enqueue_email
+
+from .emails import waitlist_promotion_email
+from .models import RSVP, Event
+from .rsvp_counts import rsvp_changed, rsvps_deleted
+
+
+def claim_seat(event_id, from_status=None):
+    """
+    Take one seat with a conditional UPDATE that only matches while going_count is
+    below capacity, moving the RSVP off `from_status`'s counter in the same statement.
+    The database serializes concurrent claims, so there is no read-modify-write race.
+    Returns True if a seat was taken.
+    """
+    updates = {"going_count": F("going_count") + 1}
+    field = RSVP.COUNT_FIELDS.get(from_status)
+    if field and from_status != RSVP.GOING:
+        updates[field] = Greatest(F(field) - 1, 0)
+    return bool(
+        Event.objects.filter(pk=event_id)
+        .filter(Q(capacity__isnull=True) | Q(going_count__lt=F("capacity")))
+        .update(**updates)
+    )
+
+
+def place_rsvp(event, attendee, status, contact_email=""):
+    """
+    Create or update `attendee`'s RSVP. Asking to go takes a seat if one is left and
+    joins the waitlist otherwise; someone already waitlisted keeps their place. Giving
+    up a seat promotes the next waitlisted RSVP. Must run inside a transaction.
+    Returns (rsvp, created, previous_status).
+    """
+    try:
+        with transaction.atomic():
+            return _place_rsvp(event, attendee, status, contact_email)
+    except IntegrityError:
+        # A simultaneous first RSVP from the same attendee created the row after our
+        # lookup; the savepoint undid our counter changes, so redo it as an update
+        return _place_rsvp(event, attendee, status, contact_email)
+
+
+def _locked_rsvp(event, attendee):
+    return RSVP.objects.select_for_update().filter(event=event, attendee=attendee).first()
+
+
+def _place_rsvp(event, attendee, status, contact_email):
+    rsvp = _locked_rsvp(event, attendee)
+    created = rsvp is None
+    previous_status = None if created else rsvp.status
+    if created:
+        rsvp = RSVP(event=event, attendee=attendee)
+
+    if status == RSVP.GOING and previous_status in (RSVP.GOING, RSVP.WAITLISTED):
+        status = previous_status
+    elif status == RSVP.GOING:
+        if not claim_seat(event.id, previous_status):
+            status = RSVP.WAITLISTED
+            rsvp_changed(event.id, previous_status, status)
+    else:
+        rsvp_changed(event.id, previous_status, status)
+
+    if status == RSVP.WAITLISTED and previous_status != RSVP.WAITLISTED:
+        rsvp.waitlisted_at = timezone.now()
+    elif status != RSVP.WAITLISTED:
+        rsvp.waitlisted_at = None
+    rsvp.status = status
+    rsvp.contact_email = contact_email
+    rsvp.save()
+
+    if previous_status == RSVP.GOING and status != RSVP.GOING:
+        promote_waitlist(event)
+    return rsvp, created, previous_status
+
+
+def waitlist_position(rsvp):
+    """1-based place of a waitlisted RSVP in its event's queue."""
+    return RSVP.objects.filter(
+        Q(waitlisted_at__lt=rsvp.waitlisted_at) | Q(waitlisted_at=rsvp.waitlisted_at, id__lte=rsvp.id),
+        event_id=rsvp.event_id,
+        status=RSVP.WAITLISTED,
+    ).count()
+
+
+def promote_waitlist(event):
+    """
+    Move waitlisted RSVPs to Going, oldest first, while seats are free, and queue
+    an email to each promoted attendee. Must run inside a transaction.
+    Returns the number promoted.
+    """
+    promoted = 0
+    while True:
+        # SKIP LOCKED: an RSVP being changed right now is passed over, not waited on
+        candidate = (
+            RSVP.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(event_id=event.id, status=RSVP.WAITLISTED)
+            .select_related("attendee")
+            .order_by("waitlisted_at", "id")
+            .first()
+        )
+        if candidate is None or not claim_seat(event.id, RSVP.WAITLISTED):
+            return promoted
+
+        candidate.status = RSVP.GOING
+        candidate.waitlisted_at = None
+        candidate.save(update_fields=["status", "waitlisted_at"])
+        email = (candidate.contact_email or candidate.attendee.email or "").strip()
+        enqueue_email(*waitlist_promotion_email(event), [email])
+        promoted += 1
+
+
+def release_rsvps(queryset):
+    """Delete RSVPs like rsvps_deleted, then fill the seats they freed from the waitlist."""
+    per_event = rsvps_deleted(queryset)
+    freed = [event_id for event_id, deltas in per_event.items() if deltas[RSVP.GOING] < 0]
+    for event in Event.objects.filter(pk__in=freed):
+        promote_waitlist(event)
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'attendees',
     'admin_dashboard',
     'messaging',
+    'notifications',
 
 ]
 
@@ -85,9 +86,44 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock at BEGIN so concurrent writers (e.g. RSVP bursts) queue
+            # on the busy timeout instead of failing with "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Shared by the web process and the worker commands (geocode_worker, backfill_geocodes, ...),
+# so cache invalidations made in one process are seen by the others. A per-process
+# LocMemCache would keep cached attendee counts and analytics stale after a worker write.
+# The tables are created by events migrations 0022/0023 (or `manage.py createcachetable`).
+#
+# 'default' holds the per-event/per-organizer version tokens (no expiry, one or two per
+# event), attendee search counts and organizer analytics; MAX_ENTRIES leaves plenty of room
+# above that so culling (which drops 1/CULL_FREQUENCY of the keys once full) stays rare.
+# 'routes' holds the Routes API results (event x origin cell x mode, one hour each), which
+# would otherwise crowd everything else out of a shared budget.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'eventsphere_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+    'routes': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'eventsphere_route_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -0,0 +1,41 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import FanoutJob, OutboxEmail, RSVPActivity, ScheduledReminder
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "recipients")
+    readonly_fields = ("created_at", "sent_at", "last_error")
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected emails")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=OutboxEmail.STATUS_SENT).update(
+            status=OutboxEmail.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} email(s) requeued.")
+
+
+@admin.register(FanoutJob)
+class FanoutJobAdmin(admin.ModelAdmin):
+    list_display = ("event", "kind", "status", "sent", "deferred", "total", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    readonly_fields = ("cursor", "sent", "deferred", "total", "created_at", "finished_at")
+
+
+@admin.register(ScheduledReminder)
+class ScheduledReminderAdmin(admin.ModelAdmin):
+    list_display = ("event", "window_minutes", "job", "created_at")
+    list_filter = ("window_minutes",)
+
+
+@admin.register(RSVPActivity)
+class RSVPActivityAdmin(admin.ModelAdmin):
+    list_display = ("event", "attendee_name", "action", "status", "organizer", "created_at")
+    list_filter = ("action",)
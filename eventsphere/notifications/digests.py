@@ -0,0 +1,113 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.expressions import Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from events.models import EventOrganizer
+
+from .models import RSVPActivity
+from .utils import enqueue_email
+
+DIGEST_INTERVAL = getattr(settings, "DIGEST_INTERVAL", timedelta(hours=1))
+DIGEST_LATEST_CHANGES = getattr(settings, "DIGEST_LATEST_CHANGES", 10)
+
+
+def wants_digest(user):
+    return EventOrganizer.objects.filter(profile__user=user, digest_opt_in=True).exists()
+
+
+def record_rsvp_activity(event, attendee_name, action, status=""):
+    RSVPActivity.objects.create(
+        organizer_id=event.organizer_id,
+        event=event,
+        action=action,
+        status=status,
+        attendee_name=attendee_name[:150],
+    )
+
+
+def send_rsvp_digests(interval=DIGEST_INTERVAL, now=None):
+    """
+    Queue one digest email per organizer with pending RSVP activity whose last digest
+    is at least `interval` old. Per-event counts come from a single grouped query and
+    the latest changes from one windowed query; summarized rows are then deleted.
+    Returns the number of digests queued.
+    """
+    now = now or timezone.now()
+    cutoff = RSVPActivity.objects.aggregate(last=Max("id"))["last"]
+    if cutoff is None:
+        return 0
+
+    recent = EventOrganizer.objects.filter(last_digest_at__gt=now - interval).values("profile__user_id")
+    pending = RSVPActivity.objects.filter(id__lte=cutoff).exclude(organizer_id__in=recent)
+
+    counts = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    titles = {}
+    for row in (
+        pending.values("organizer_id", "event_id", "event__title")
+        .annotate(
+            created=Count("id", filter=Q(action=RSVPActivity.ACTION_CREATED)),
+            updated=Count("id", filter=Q(action=RSVPActivity.ACTION_UPDATED)),
+            cancelled=Count("id", filter=Q(action=RSVPActivity.ACTION_CANCELLED)),
+            latest=Max("created_at"),
+        )
+        .order_by("organizer_id", "-latest")
+    ):
+        titles[row["event_id"]] = row["event__title"]
+        for action in ("created", "updated", "cancelled"):
+            counts[row["organizer_id"]][row["event_id"]][action] = row[action]
+
+    if not counts:
+        return 0
+
+    latest = defaultdict(list)
+    for activity in (
+        pending.annotate(
+            rank=Window(RowNumber(), partition_by=[F("organizer_id")], order_by=F("created_at").desc())
+        )
+        .filter(rank__lte=DIGEST_LATEST_CHANGES)
+        .order_by("organizer_id", "rank")
+    ):
+        latest[activity.organizer_id].append(activity)
+
+    users = get_user_model().objects.in_bulk(list(counts))
+    queued = 0
+    for organizer_id, per_event in counts.items():
+        user = users[organizer_id]
+        with transaction.atomic():
+            if enqueue_email(*_digest_email(user, per_event, titles, latest[organizer_id]), [user.email]):
+                queued += 1
+            pending.filter(organizer_id=organizer_id).delete()
+            EventOrganizer.objects.filter(profile__user_id=organizer_id).update(last_digest_at=now)
+
+    return queued
+
+
+def _digest_email(user, per_event, titles, latest):
+    total = sum(sum(c.values()) for c in per_event.values())
+    lines = [
+        f"Hello {user.username},\n",
+        f"There were {total} RSVP change(s) on your events since your last digest.\n",
+    ]
+    for event_id, c in per_event.items():
+        lines.append(
+            f"- '{titles[event_id]}': {c['created']} new, {c['updated']} updated, {c['cancelled']} cancelled"
+        )
+
+    lines.append("\nLatest changes:")
+    for activity in latest:
+        when = timezone.localtime(activity.created_at).strftime("%b %d, %I:%M %p")
+        status = f" ({activity.status.replace('_', ' ')})" if activity.status else ""
+        lines.append(
+            f"- {when}: {activity.attendee_name} - {activity.get_action_display()}{status} "
+            f"for '{titles.get(activity.event_id, activity.event_id)}'"
+        )
+    lines.append("\n— EventSphere Team")
+
+    return f"RSVP digest: {total} change(s) on your events", "\n".join(lines)
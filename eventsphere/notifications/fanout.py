@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import RSVP
+
+from .models import FanoutJob
+from .utils import OUTBOX_LEASE, enqueue_email
+
+FANOUT_BATCH_SIZE = getattr(settings, "FANOUT_BATCH_SIZE", 100)
+
+
+def start_fanout(event, kind, subject, body, statuses=(RSVP.GOING, RSVP.INTERESTED), from_email=None, total=None):
+    """
+    Queue `subject`/`body` for every RSVP of `event` with one of `statuses`, plus a
+    single copy to the organizer. Pass `total` when the matching RSVP count is already
+    known. Returns the FanoutJob, or None if nobody matches.
+    """
+    if total is None:
+        total = event.rsvps.filter(status__in=statuses).count()
+    if not total:
+        return None
+
+    job = FanoutJob.objects.create(
+        event=event,
+        kind=kind,
+        subject=subject[:255],
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        rsvp_statuses=list(statuses),
+        total=total,
+    )
+    enqueue_email(subject, body, [event.organizer.email], from_email=job.from_email)
+    return job
+
+
+def claim_fanout_job():
+    """Lease the oldest due job to this worker, the same way claim_outbox_batch does."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            FanoutJob.objects.select_for_update(skip_locked=True)
+            .filter(status=FanoutJob.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .first()
+        )
+        if job is not None:
+            FanoutJob.objects.filter(pk=job.pk).update(next_attempt_at=now + OUTBOX_LEASE)
+    return job
+
+
+def run_fanout_batch(job, connection, batch_size=FANOUT_BATCH_SIZE):
+    """
+    Send the job's next batch_size recipients, one message each over `connection`,
+    then save the cursor and counts. A recipient whose send fails is queued in the
+    outbox, which retries and dead-letters it. Returns the number of RSVPs handled.
+    """
+    rsvps = list(
+        RSVP.objects.filter(event_id=job.event_id, status__in=job.rsvp_statuses, id__gt=job.cursor)
+        .select_related("attendee")
+        .order_by("id")[:batch_size]
+    )
+
+    seen = set()
+    for rsvp in rsvps:
+        email = (rsvp.contact_email or getattr(rsvp.attendee, "email", "") or "").strip()
+        if not email or email.lower() in seen:
+            continue
+        seen.add(email.lower())
+
+        message = EmailMessage(job.subject, job.body, job.from_email, [email], connection=connection)
+        try:
+            connection.open()
+            message.send()
+            job.sent += 1
+        except Exception as e:
+            print(f"[Email Error] Fan-out job {job.pk} could not send to one recipient: {e}")
+            connection.close()
+            enqueue_email(job.subject, job.body, [email], from_email=job.from_email)
+            job.deferred += 1
+
+    if rsvps:
+        job.cursor = rsvps[-1].id
+    if len(rsvps) < batch_size:
+        job.status = FanoutJob.STATUS_DONE
+        job.finished_at = timezone.now()
+    # Release the lease so the next batch can be picked up straight away
+    job.next_attempt_at = timezone.now()
+    job.save(update_fields=["cursor", "sent", "deferred", "status", "finished_at", "next_attempt_at"])
+    return len(rsvps)
+
+
+def send_fanout_batch(connection, batch_size=FANOUT_BATCH_SIZE):
+    """Run one batch of the oldest due fan-out job. Returns (job, handled), or (None, 0) when idle."""
+    job = claim_fanout_job()
+    if job is None:
+        return None, 0
+    return job, run_fanout_batch(job, connection, batch_size)
@@ -0,0 +1,38 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.reminders import REMINDER_WINDOWS, schedule_reminders
+
+UNITS = {"d": "days", "h": "hours", "m": "minutes"}
+
+
+def parse_window(value):
+    match = re.fullmatch(r"\s*(\d+)\s*([dhm])\s*", value)
+    if not match:
+        raise CommandError(f"Invalid window '{value}'; use e.g. 24h, 90m or 2d.")
+    return timedelta(**{UNITS[match.group(2)]: int(match.group(1))})
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue automatic reminders for approved events starting within the given windows. "
+        "Run it periodically (e.g. every 5 minutes); each event/window is reminded once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--windows", default=None,
+            help="Comma-separated windows before the start, e.g. 24h,1h. Defaults to REMINDER_WINDOWS.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["windows"]:
+            windows = [parse_window(w) for w in options["windows"].split(",")]
+        else:
+            windows = REMINDER_WINDOWS
+
+        queued, marked = schedule_reminders(windows, chunk_size=options["chunk_size"])
+        self.stdout.write(f"Queued {queued} reminder(s); recorded {marked} event window(s).")
@@ -0,0 +1,51 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from notifications.fanout import FANOUT_BATCH_SIZE, send_fanout_batch
+from notifications.utils import OUTBOX_MAX_ATTEMPTS, send_outbox_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued outbox emails and reminder/update fan-out jobs, "
+        "reusing one mail connection while there is work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to wait when the outbox is drained.")
+        parser.add_argument("--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--fanout-batch-size", type=int, default=FANOUT_BATCH_SIZE,
+            help="Recipients per fan-out batch; progress is saved after each batch.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the outbox is drained instead of polling.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        connection = get_connection()
+
+        try:
+            while True:
+                sent, retrying, dead = send_outbox_batch(batch_size, connection, options["max_attempts"])
+                if sent or retrying or dead:
+                    self.stdout.write(f"Sent {sent}, retrying later {retrying}, dead-lettered {dead}")
+
+                job, handled = send_fanout_batch(connection, options["fanout_batch_size"])
+                if job is not None:
+                    self.stdout.write(
+                        f"{job.get_kind_display()} for event {job.event_id}: "
+                        f"{job.sent} sent, {job.deferred} deferred of {job.total}"
+                        + (" (done)" if job.status == job.STATUS_DONE else "")
+                    )
+
+                if sent + retrying + dead < batch_size and job is None:
+                    # Don't hold an idle SMTP session open between polls
+                    connection.close()
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+        finally:
+            connection.close()
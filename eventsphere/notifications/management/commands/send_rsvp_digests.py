@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from notifications.digests import DIGEST_INTERVAL, send_rsvp_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue one RSVP activity digest per opted-in organizer. Run it periodically; "
+        "organizers get at most one digest per --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float, default=DIGEST_INTERVAL.total_seconds() / 60,
+            help="Minimum minutes between two digests to the same organizer.",
+        )
+
+    def handle(self, *args, **options):
+        queued = send_rsvp_digests(timedelta(minutes=options["interval"]))
+        self.stdout.write(f"Queued {queued} digest(s).")
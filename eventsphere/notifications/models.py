@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be sent by the send_outbox worker. Rows are written in the
+    same transaction as the change they describe, so nothing is sent for a rolled-back
+    request and nothing is lost if SMTP is down.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead letter"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)}"
+
+
+class FanoutJob(models.Model):
+    """
+    One message (reminder or update) going to every matching RSVP of an event.
+    The body is rendered once; the send_outbox worker walks the RSVPs in id order,
+    sending one email per recipient, and stores its position in `cursor` after each
+    batch so an interrupted job resumes where it left off.
+    """
+    KIND_REMINDER = "reminder"
+    KIND_UPDATE = "update"
+
+    KIND_CHOICES = [
+        (KIND_REMINDER, "Reminder"),
+        (KIND_UPDATE, "Event update"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "In progress"),
+        (STATUS_DONE, "Done"),
+    ]
+
+    event = models.ForeignKey("events.Event", on_delete=models.CASCADE, related_name="fanout_jobs")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    rsvp_statuses = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    cursor = models.BigIntegerField(default=0)  # id of the last RSVP handled
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    deferred = models.PositiveIntegerField(default=0)  # failed sends handed to the outbox for retry
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="fanout_status_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.event} ({self.sent}/{self.total})"
+
+    @property
+    def processed(self):
+        return self.sent + self.deferred
+
+
+class ScheduledReminder(models.Model):
+    """Marks that the automatic reminder for one (event, window) has been handled."""
+    event = models.ForeignKey("events.Event", on_delete=models.CASCADE, related_name="scheduled_reminders")
+    window_minutes = models.PositiveIntegerField()
+    # Null when nobody had RSVP'd, or when a tighter window's reminder went out instead
+    job = models.ForeignKey(FanoutJob, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("event", "window_minutes")
+
+    def __str__(self):
+        return f"{self.event} ({self.window_minutes} min before)"
+
+
+class RSVPActivity(models.Model):
+    """
+    One RSVP change on an event whose organizer gets digests. Rows are deleted once
+    they have been summarized, so the table only holds activity not yet reported.
+    """
+    ACTION_CREATED = "created"
+    ACTION_UPDATED = "updated"
+    ACTION_CANCELLED = "cancelled"
+
+    ACTION_CHOICES = [
+        (ACTION_CREATED, "New RSVP"),
+        (ACTION_UPDATED, "Updated RSVP"),
+        (ACTION_CANCELLED, "Cancelled RSVP"),
+    ]
+
+    # Denormalized from event.organizer so the digest can group without joining events
+    organizer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    event = models.ForeignKey("events.Event", on_delete=models.CASCADE, related_name="+")
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=20, blank=True)  # RSVP status after the change
+    attendee_name = models.CharField(max_length=150)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["organizer", "created_at"], name="rsvp_activity_org_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.attendee_name} {self.action} ({self.event_id})"
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from events.emails import reminder_email
+from events.models import RSVP, Event
+
+from .fanout import start_fanout
+from .models import FanoutJob, ScheduledReminder
+
+REMINDER_WINDOWS = getattr(settings, "REMINDER_WINDOWS", [timedelta(hours=24), timedelta(hours=1)])
+REMINDER_RSVP_STATUSES = (RSVP.GOING, RSVP.INTERESTED)
+
+
+def event_start(event):
+    """Aware start time of an event. Events without a time are treated as starting at midnight."""
+    return timezone.make_aware(datetime.combine(event.date, event.time or dt_time.min))
+
+
+def due_event_candidates(widest, now):
+    """
+    Approved events dated between today and now + widest, with the number of RSVPs a
+    reminder would go to, in one query over the (approval_status, date) index.
+    Streamed with iterator() rather than loaded into memory.
+    """
+    return (
+        Event.objects.filter(
+            approval_status=Event.STATUS_APPROVED,
+            date__gte=now.date(),
+            date__lte=(now + widest).date(),
+        )
+        .select_related("organizer")
+        .annotate(reminder_rsvps=Count("rsvps", filter=Q(rsvps__status__in=REMINDER_RSVP_STATUSES)))
+        .order_by("date", "time", "id")
+        .iterator(chunk_size=500)
+    )
+
+
+def schedule_reminders(windows=REMINDER_WINDOWS, now=None, chunk_size=500):
+    """
+    Queue reminders for events starting within any of `windows` (timedeltas before the
+    start). Each (event, window) is handled exactly once, recorded by a ScheduledReminder.
+    When several windows are due at once, e.g. after the scheduler was down, only the
+    tightest one sends, and nothing sends for a window wider than one already handled. Returns (queued, marked): reminders queued and windows recorded.
+    """
+    now = now or timezone.localtime()
+    window_minutes = sorted(int(w.total_seconds() // 60) for w in windows)
+    queued = marked = 0
+
+    chunk = []
+    for event in due_event_candidates(max(windows), now):
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+            q, m = _schedule_chunk(chunk, window_minutes, now)
+            queued, marked = queued + q, marked + m
+            chunk = []
+    if chunk:
+        q, m = _schedule_chunk(chunk, window_minutes, now)
+        queued, marked = queued + q, marked + m
+
+    return queued, marked
+
+
+def _schedule_chunk(events, window_minutes, now):
+    handled = defaultdict(set)
+    for event_id, minutes in (
+        ScheduledReminder.objects.filter(event__in=[e.id for e in events])
+        .values_list("event_id", "window_minutes")
+    ):
+        handled[event_id].add(minutes)
+    queued = marked = 0
+
+    for event in events:
+        start = event_start(event)
+        if start <= now:
+            continue
+        due = [m for m in window_minutes if start - timedelta(minutes=m) <= now]
+        new = [m for m in due if m not in handled[event.id]]
+        if not new:
+            continue
+        # Nothing to send if this window, or a tighter one, was already handled
+        send = not any(m <= due[0] for m in handled[event.id]) and event.reminder_rsvps
+
+        try:
+            with transaction.atomic():
+                ScheduledReminder.objects.bulk_create(
+                    [ScheduledReminder(event=event, window_minutes=m) for m in new]
+                )
+                if send:
+                    subject, message = reminder_email(event)
+                    job = start_fanout(
+                        event, FanoutJob.KIND_REMINDER, subject, message,
+                        statuses=REMINDER_RSVP_STATUSES, total=event.reminder_rsvps,
+                    )
+                    ScheduledReminder.objects.filter(event=event, window_minutes=new[0]).update(job=job)
+                    queued += 1
+        except IntegrityError:
+            # Another scheduler run recorded this event first
+            continue
+        marked += len(new)
+
+    return queued, marked
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import OutboxEmail
+from .utils import OUTBOX_LEASE, claim_outbox_batch, enqueue_email, send_outbox_batch
+
+
+class FlakyEmailBackend(EmailBackend):
+    """locmem backend whose first `failures` sends raise, like a dropped SMTP session."""
+
+    failures = 0
+
+    def send_messages(self, messages):
+        if FlakyEmailBackend.failures:
+            FlakyEmailBackend.failures -= 1
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class SendOutboxTests(TestCase):
+    def tearDown(self):
+        FlakyEmailBackend.failures = 0
+
+    def send_outbox(self):
+        call_command("send_outbox", "--once", stdout=StringIO())
+
+    def test_delivers_each_email_once(self):
+        email = enqueue_email("Hello", "Body", ["b@example.com", "a@example.com", " "])
+
+        self.send_outbox()
+        self.send_outbox()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["a@example.com", "b@example.com"])
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_SENT, 1))
+        self.assertIsNotNone(email.sent_at)
+
+    def test_backend_error_is_retried_with_backoff(self):
+        email = enqueue_email("Hello", "Body", ["a@example.com"])
+        FlakyEmailBackend.failures = 1
+
+        with override_settings(EMAIL_BACKEND="notifications.tests.FlakyEmailBackend"):
+            before = timezone.now()
+            self.assertEqual(send_outbox_batch(), (0, 1, 0))
+
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_PENDING, 1))
+            self.assertIn("Connection unexpectedly closed", email.last_error)
+            # First retry waits OUTBOX_RETRY_BASE (one minute) give or take 20% jitter
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=48))
+            self.assertLessEqual(email.next_attempt_at, timezone.now() + timedelta(seconds=72))
+
+            # Not due yet, so nothing is sent
+            self.assertEqual(send_outbox_batch(), (0, 0, 0))
+
+            OutboxEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(send_outbox_batch(), (1, 0, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_SENT, 2))
+
+    def test_dead_letters_after_max_attempts(self):
+        email = enqueue_email("Hello", "Body", ["a@example.com"])
+        FlakyEmailBackend.failures = 2
+
+        with override_settings(EMAIL_BACKEND="notifications.tests.FlakyEmailBackend"):
+            self.assertEqual(send_outbox_batch(max_attempts=2), (0, 1, 0))
+            OutboxEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(send_outbox_batch(max_attempts=2), (0, 0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_DEAD, 2))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_skips_rows_claimed_by_another_worker(self):
+        claimed = enqueue_email("Claimed", "Body", ["a@example.com"])
+        free = enqueue_email("Free", "Body", ["b@example.com"])
+
+        # Another worker leased the first row and hasn't finished with it
+        self.assertEqual(claim_outbox_batch(1), [claimed])
+        claimed.refresh_from_db()
+        self.assertGreater(claimed.next_attempt_at, timezone.now() + OUTBOX_LEASE - timedelta(minutes=1))
+
+        self.send_outbox()
+
+        self.assertEqual([message.subject for message in mail.outbox], ["Free"])
+        claimed.refresh_from_db()
+        free.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.attempts), (OutboxEmail.STATUS_PENDING, 0))
+        self.assertEqual(free.status, OutboxEmail.STATUS_SENT)
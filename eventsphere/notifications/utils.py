@@ -0,0 +1,118 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+OUTBOX_MAX_ATTEMPTS = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 6)
+OUTBOX_RETRY_BASE = getattr(settings, "OUTBOX_RETRY_BASE", timedelta(minutes=1))
+OUTBOX_RETRY_MAX = getattr(settings, "OUTBOX_RETRY_MAX", timedelta(hours=2))
+# How long a claimed row stays hidden from other workers; also covers a worker crashing mid-batch
+OUTBOX_LEASE = getattr(settings, "OUTBOX_LEASE", timedelta(minutes=10))
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """
+    Queue an email for the send_outbox worker. Call it inside the transaction that
+    makes the change being announced. Blank recipients are dropped; returns the
+    OutboxEmail, or None when nobody is left to send to.
+    """
+    recipients = sorted({r.strip() for r in recipients if r and r.strip()})
+    if not recipients:
+        return None
+
+    return OutboxEmail.objects.create(
+        subject=subject[:255],
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=recipients,
+    )
+
+
+def enqueue_emails(messages, from_email=None):
+    """
+    Bulk version of enqueue_email for (subject, body, recipients) tuples, written in
+    one INSERT per batch. Returns the number of emails queued.
+    """
+    rows = []
+    for subject, body, recipients in messages:
+        recipients = sorted({r.strip() for r in recipients if r and r.strip()})
+        if recipients:
+            rows.append(OutboxEmail(
+                subject=subject[:255],
+                body=body,
+                from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                recipients=recipients,
+            ))
+    OutboxEmail.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter after `attempts` failed sends."""
+    delay = min(OUTBOX_RETRY_MAX, OUTBOX_RETRY_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_outbox_batch(batch_size):
+    """
+    Lease up to batch_size due emails to this worker by pushing their next_attempt_at
+    past OUTBOX_LEASE. Uses SKIP LOCKED where supported so several workers can run.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[e.pk for e in emails]).update(next_attempt_at=now + OUTBOX_LEASE)
+    return emails
+
+
+def send_outbox_batch(batch_size=50, connection=None, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    """
+    Send one batch of due outbox emails over a single mail connection.
+    Failed emails are retried with backoff and dead-lettered after max_attempts.
+    Returns (sent, retrying, dead) counts; all zero means nothing was due.
+    """
+    emails = claim_outbox_batch(batch_size)
+    if not emails:
+        return 0, 0, 0
+
+    sent = retrying = dead = 0
+    connection = connection or get_connection()
+
+    for email in emails:
+        message = EmailMessage(
+            email.subject, email.body, email.from_email, email.recipients, connection=connection
+        )
+        try:
+            # open() is a no-op while the connection is up, and reconnects after a failure
+            connection.open()
+            message.send()
+        except Exception as e:
+            print(f"[Email Error] Outbox email {email.pk} failed: {e}")
+            connection.close()
+            email.attempts += 1
+            email.last_error = str(e)
+            if email.attempts >= max_attempts:
+                email.status = OutboxEmail.STATUS_DEAD
+                dead += 1
+            else:
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                retrying += 1
+            email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+            continue
+
+        email.status = OutboxEmail.STATUS_SENT
+        email.sent_at = timezone.now()
+        email.attempts += 1
+        email.save(update_fields=["status", "sent_at", "attempts"])
+        sent += 1
+
+    return sent, retrying, dead